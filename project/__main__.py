@@ -1,8 +1,10 @@
+import argparse
 import logging
 
-from pygame import quit
+from project.startup import trace
 
-from project.game import Game
+with trace.phase('import pygame'):
+    import pygame as pg
 
 LOG_LEVEL = logging.INFO
 
@@ -15,12 +17,91 @@ stream_handler.setFormatter(formatter)
 stream_handler.setLevel(LOG_LEVEL)
 last_judgment_logger.addHandler(stream_handler)
 
-last_judgment_logger.info('Welcome to Last Judgment')
+parser = argparse.ArgumentParser(prog='python -m project', description='Last Judgment')
+parser.add_argument('--headless', action='store_true',
+                    help='run without display and audio, as fast as possible, skipping the menus')
+parser.add_argument('--seed', type=int, default=None, help='seed for every random roll in the game')
+parser.add_argument('--frames', type=int, default=None, help='quit after this many game frames')
+parser.add_argument('--array-projectiles', action='store_true',
+                    help='simulate projectiles in numpy arrays instead of sprites (needs numpy)')
+parser.add_argument('--ecs', action='store_true',
+                    help='keep the entities in the numpy arrays of an entity-component World (needs numpy)')
+parser.add_argument('--batch-physics', action='store_true',
+                    help='move the sprites together in numpy arrays instead of one by one (needs numpy)')
+parser.add_argument('--dirty-rects', action='store_true',
+                    help='update only the changed parts of the screen instead of flipping every frame, with a still '
+                         'background (for slow displays)')
+parser.add_argument('--tick-rate', type=float, default=None,
+                    help='simulation ticks per second, higher plays the game faster (default TICK_RATE)')
+parser.add_argument('--record', metavar='FILE', help='record the keys pressed every tick and the seed to FILE')
+parser.add_argument('--replay', metavar='FILE',
+                    help='play a recording again, tick for tick (with --headless as fast as possible)')
+parser.add_argument('--profile', action='store_true',
+                    help='show the frame profiler, printed at the end with --headless')
+parser.add_argument('--leak-check', action='store_true',
+                    help='log what outlives its owner and groups that keep growing, checked between waves')
+parser.add_argument('--startup-report', action='store_true',
+                    help='print where the time went until the first frame was drawn, then quit')
 
 if __name__ == '__main__':
-    a = Game()
-    a.show_start_screen()
-    a.play_intro()
-    while a.running:
-        a.new()
-quit()
+    args = parser.parse_args()
+
+    from project import simulation
+    from project.gameplay.replay import Recorder, Replay
+
+    controls = None
+    if args.replay:
+        controls = Replay(args.replay)
+        # The recording's options over the command line's, the simulation depends on them
+        args.seed = controls.header['seed']
+        args.tick_rate = controls.header['tick_rate']
+        args.array_projectiles = controls.header['array_projectiles']
+        args.ecs = controls.header.get('ecs', False)
+
+    simulation.configure(args.headless, args.seed)
+    with trace.phase('import project.game'):
+        from project.constants import TICK_RATE
+        from project.game import Game
+
+    if args.record:
+        controls = Recorder(args.record, {'seed': simulation.seed, 'tick_rate': args.tick_rate or TICK_RATE,
+                                          'array_projectiles': args.array_projectiles, 'ecs': args.ecs})
+
+    last_judgment_logger.info('Welcome to Last Judgment')
+
+    with trace.phase('Game()'):
+        a = Game(1 if args.startup_report else args.frames, args.array_projectiles, args.dirty_rects,
+                 args.tick_rate or TICK_RATE, args.profile or None, controls, args.leak_check, args.ecs,
+                 args.batch_physics)
+
+    if args.startup_report:
+        if args.headless:
+            a.new()
+        else:
+            a.draw_start_screen()
+        print(trace.report())
+    else:
+        try:
+            if not args.headless and not args.replay:
+                a.show_start_screen()
+                a.play_intro()
+            while a.running:
+                a.new()
+        finally:
+            # Also when the game crashed, that's a session worth playing again
+            if args.record:
+                controls.save()
+
+        if args.profile and args.headless:
+            for name, value in a.profiler.stats().items():
+                print(f'{name:10} {value:7.2f} ms')
+
+        from project.resources import registry
+        cache = registry.stats()
+        last_judgment_logger.info(f'Asset cache: {cache["hits"]} hits, {cache["misses"]} misses, '
+                                  f'{cache["evictions"]} evictions, {cache["bytes"] // 1024} KB in use')
+
+        # Writes out a pending settings change right away instead of waiting for the timer, nothing if there's none
+        from project.settings import settings
+        settings.save()
+pg.quit()
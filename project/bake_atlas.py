@@ -0,0 +1,81 @@
+"""
+Bakes the sprites listed in assets/atlas/manifest.json into assets/atlas/atlas.png and assets/atlas/index.json.
+
+Run it after changing the manifest or one of the sheets it cuts from:
+    python -m project.bake_atlas
+"""
+import json
+import logging
+from pathlib import PurePath
+
+import pygame as pg
+
+from project import simulation
+simulation.use_dummy_drivers()
+from project.constants import PATH_ASSETS, PATH_ATLAS  # noqa: E402 needs the dummy drivers
+from project.resources import registry  # noqa: E402
+
+logger = logging.getLogger('last_judgment_logger')
+
+ATLAS_WIDTH = 512
+ATLAS_IMAGE = 'atlas.png'
+
+
+def cut(entry: dict) -> pg.Surface:
+    """
+    The sprite the same way Sheet.get_image would cut it, on black.
+    """
+    region = tuple(entry['region'])
+    scale = tuple(entry['scale']) if 'scale' in entry else None
+    sprite = registry.image(str(PurePath(PATH_ASSETS).joinpath(entry['sheet'])), region, scale)
+
+    surface = pg.Surface(sprite.get_size())
+    surface.blit(sprite, (0, 0))
+    return surface
+
+
+def pack(sizes: dict, width: int) -> tuple:
+    """
+    Shelf packing, tallest sprites first.
+
+    :return: (name -> (x, y, width, height), atlas height)
+    """
+    regions = {}
+    x = y = shelf = 0
+    for name in sorted(sizes, key=lambda name: (-sizes[name][1], name)):
+        w, h = sizes[name]
+        if x + w > width:
+            x, y = 0, y + shelf
+            shelf = 0
+        regions[name] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return regions, y + shelf
+
+
+def bake(path=PATH_ATLAS) -> dict:
+    with open(str(PurePath(path).joinpath('manifest.json'))) as f:
+        manifest = json.load(f)
+
+    sprites = {name: cut(entry) for name, entry in manifest.items()}
+    width = max(ATLAS_WIDTH, max(sprite.get_width() for sprite in sprites.values()))
+    regions, height = pack({name: sprite.get_size() for name, sprite in sprites.items()}, width)
+
+    atlas = pg.Surface((width, height))
+    for name, sprite in sprites.items():
+        atlas.blit(sprite, regions[name][:2])
+    pg.image.save(atlas, str(PurePath(path).joinpath(ATLAS_IMAGE)))
+
+    index = {'image': ATLAS_IMAGE, 'regions': {name: list(regions[name]) for name in sorted(regions)}}
+    with open(str(PurePath(path).joinpath('index.json')), 'w') as f:
+        lines = (f'    {json.dumps(name)}: {json.dumps(region)}' for name, region in index['regions'].items())
+        f.write(f'{{\n  "image": {json.dumps(ATLAS_IMAGE)},\n  "regions": {{\n' + ',\n'.join(lines) + '\n  }\n}\n')
+
+    logger.info(f'Baked {len(sprites)} sprites into a {width}x{height} atlas')
+    return index
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    pg.display.set_mode((1, 1))
+    bake()
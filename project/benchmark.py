@@ -0,0 +1,296 @@
+"""
+Plays canned scenarios headless and compares how long their frames took with benchmark_baseline.json.
+
+Every scenario runs in a process of its own, for a fixed number of frames with a fixed seed:
+    python -m project.benchmark                 runs every scenario, exits with 1 if one got slower
+    python -m project.benchmark wave_10 menu    runs only these
+    python -m project.benchmark --save          stores the results as the new baseline
+
+Timings depend on the machine, store a baseline on the machine the comparisons will run on. After the frames the games
+also measure what a live projectile, item and enemy healthbar weigh, see entity_memory(), and every scenario reports
+what its counters saw, see COUNTERS.
+"""
+import argparse
+import gc
+import importlib
+import json
+import math
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import PurePath
+
+import pygame as pg
+
+from project import simulation
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PATH_BASELINE = PurePath(__file__).parent.joinpath('benchmark_baseline.json')
+SEED = 1
+
+# Share a number may grow by before it counts as a regression
+TOLERANCE = 0.25
+# Differences below these never count, they're noise: milliseconds, blocks, kilobytes
+MIN_TIME_CHANGE = 0.1
+MIN_BLOCK_CHANGE = 1000
+MIN_RSS_CHANGE = 4096
+MIN_ENTITY_CHANGE = 64
+# Entities of every kind entity_memory() builds
+ENTITY_SAMPLE = 1000
+# Results that are counters, shown but never compared with the baseline
+COUNTERS = ('asset cache', 'projectile pool', 'pairs tested')
+
+
+def wave(difficulty: int):
+    def setup(game):
+        game.wave_generator.difficulty = difficulty
+    return setup
+
+
+def no_waves(game) -> None:
+    game.nonsprite.remove(game.wave_generator)
+
+
+def player_projectiles(count: int):
+    def step(game):
+        # Topped up every tick, spread over a fan in front of the player
+        missing = count - len(game.others)
+        for i in range(missing):
+            game.devchar._fire(((game.tick + i) % 60 - 30) * math.pi / 180, (200, 360))
+    return step
+
+
+def structures(count: int):
+    def setup(game):
+        from project.sprites.structure import Structure
+        no_waves(game)
+        for i in range(count):
+            game.kind(Structure)(game, 700 + (i % 8) * 70, pg.Vector2(2, 1), pg.Vector2(1280, 40 + (i // 8) * 140),
+                                 10 ** 6)
+    return setup
+
+
+ECS = {'ecs': True}
+BATCH_PHYSICS = {'batch_physics': True}
+
+# name: (frames, setup before the first tick, step before every tick, Game options)
+SCENARIOS = {
+    'wave_1': (300, wave(1), None, {}),
+    'wave_10': (300, wave(10), None, {}),
+    'wave_25': (300, wave(25), None, {}),
+    'wave_25_ecs': (300, wave(25), None, ECS),
+    'player_projectiles_500': (300, no_waves, player_projectiles(500), {}),
+    'player_projectiles_2000': (300, no_waves, player_projectiles(2000), {}),
+    'player_projectiles_2000_batch': (300, no_waves, player_projectiles(2000), BATCH_PHYSICS),
+    'player_projectiles_2000_ecs': (300, no_waves, player_projectiles(2000), ECS),
+    'structures_40': (300, structures(40), None, {}),
+    'menu': (300, None, None, {}),
+}
+# Game options that need numpy, their scenarios are skipped without it
+NUMPY_OPTIONS = ('ecs', 'batch_physics')
+
+
+def has_numpy() -> bool:
+    try:
+        importlib.import_module('numpy')
+    except ImportError:
+        return False
+    return True
+
+
+def distribution(times) -> dict:
+    ordered = sorted(times)
+    if not ordered:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    return {'mean': sum(ordered) / len(ordered),
+            **{f'p{share}': ordered[min(len(ordered) - 1, int(share / 100 * len(ordered)))] for share in (50, 95, 99)}}
+
+
+def entity_memory(game) -> dict:
+    """
+    Bytes per live projectile, item and enemy healthbar, with everything that comes with them: the object, its
+    vectors, rect and groups, its entries in the game's groups. Shared images and masks aren't theirs.
+    """
+    from project.sprites.game_elements import Item, Projectile
+    from project.ui.character_interface import DynamicHealthbar
+
+    kinds = {
+        'projectile': (lambda: game.kind(Projectile)(game, game.devchar, 0, spawn_point=(200, 360)),
+                       lambda projectile: projectile.destroy()),
+        'item': (lambda: game.kind(Item)(game, 'red'), lambda item: item.kill()),
+        'healthbar': (lambda: DynamicHealthbar(game, game.devchar), lambda bar: bar.kill()),
+    }
+    sizes = {}
+    for name, (build, remove) in kinds.items():
+        # Fills the caches, e.g. the rotated image
+        remove(build())
+        gc.collect()
+        tracemalloc.start()
+        entities = [build() for _ in range(ENTITY_SAMPLE)]
+        size = tracemalloc.get_traced_memory()[0] - sys.getsizeof(entities)
+        tracemalloc.stop()
+        sizes[f'bytes per {name}'] = size // ENTITY_SAMPLE
+        for entity in entities:
+            remove(entity)
+    return sizes
+
+
+def run_game(frames: int, setup, step, options: dict) -> tuple:
+    from project.game import Game
+    from project.ui.profiler import FrameProfiler
+
+    class ScenarioGame(Game):
+
+        def _update(self):
+            if self.tick == 0:
+                self.devchar.immunity = True
+                if setup is not None:
+                    setup(self)
+            if step is not None:
+                step(self)
+            super()._update()
+
+    game = ScenarioGame(frames, **options)
+    game.profiler = FrameProfiler(frames, frames, overlay=False)
+    game.new()
+    return game, {'frame': list(game.profiler.frames),
+                  **{phase: list(times) for phase, times in game.profiler.times.items()}}
+
+
+def run_menu(frames: int) -> dict:
+    from project.game import Game
+    from project.ui.main_menu import Home
+
+    game = Game()
+    home = Home(game.screen)
+    times = []
+    for _ in range(frames):
+        started = time.perf_counter()
+        home.draw()
+        pg.event.pump()
+        times.append((time.perf_counter() - started) * 1000)
+    return {'frame': times, 'draw': times}
+
+
+def run(name: str) -> dict:
+    """
+    Plays one scenario in this process.
+    """
+    frames, setup, step, options = SCENARIOS[name]
+    simulation.configure(True, SEED)
+    from project.resources import registry
+
+    gc.collect()
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    blocks = sys.getallocatedblocks()
+    if name == 'menu':
+        game, times = None, run_menu(frames)
+    else:
+        game, times = run_game(frames, setup, step, options)
+
+    result = {phase: distribution(phase_times) for phase, phase_times in times.items()}
+    result['allocated blocks'] = sys.getallocatedblocks() - blocks
+    result['gc collections'] = sum(stats['collections'] for stats in gc.get_stats()) - collections
+    result['asset cache'] = registry.stats()
+    if game is not None:
+        result['projectile pool'] = game.projectile_pool.stats()
+        result['pairs tested'] = game.pairs_tested(total=True)
+        result.update(entity_memory(game))
+    if resource is not None:
+        # Kilobytes on Linux
+        result['peak rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def regressions(name: str, result: dict, baseline: dict, tolerance: float) -> list:
+    """
+    What got worse in :param result: than in :param baseline: by more than :param tolerance:
+    """
+    found = []
+    for key, value in result.items():
+        old = baseline.get(key)
+        if old is None or key in COUNTERS:
+            continue
+        if isinstance(value, dict):
+            pairs = [(f'{key} {stat}', value[stat], old.get(stat), MIN_TIME_CHANGE) for stat in ('p50', 'p95')]
+        else:
+            floor = MIN_BLOCK_CHANGE
+            if key == 'peak rss':
+                floor = MIN_RSS_CHANGE
+            elif key.startswith('bytes per'):
+                floor = MIN_ENTITY_CHANGE
+            pairs = [(key, value, old, floor)]
+        for label, new, before, floor in pairs:
+            if before is not None and new - before > max(floor, abs(before) * tolerance):
+                found.append(f'{name}: {label} {before:.2f} -> {new:.2f}')
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m project.benchmark', description=__doc__.split('\n')[1])
+    parser.add_argument('scenarios', nargs='*', help=f'any of {", ".join(SCENARIOS)}, default: all of them')
+    parser.add_argument('--save', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f'share a number may grow by before it is a regression (default {TOLERANCE})')
+    parser.add_argument('--run', choices=list(SCENARIOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run(args.run)))
+        return 0
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+
+    numpy = has_numpy()
+    results = {}
+    for name in args.scenarios or SCENARIOS:
+        if not numpy and any(SCENARIOS[name][3].get(option) for option in NUMPY_OPTIONS):
+            print(f'{name:30} skipped, needs numpy')
+            continue
+        output = subprocess.run([sys.executable, '-m', 'project.benchmark', '--run', name],
+                                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+        results[name] = json.loads(output.splitlines()[-1])
+        frame = results[name]['frame']
+        print(f'{name:30} frame p50 {frame["p50"]:6.2f} ms  p95 {frame["p95"]:6.2f}  p99 {frame["p99"]:6.2f}  '
+              f'blocks {results[name]["allocated blocks"]:+8d}  rss {results[name].get("peak rss", 0) // 1024} MB')
+        sizes = [f'{key.split()[-1]} {value}' for key, value in results[name].items() if key.startswith('bytes per')]
+        if sizes:
+            print(f'{"":30} bytes per {"  ".join(sizes)}')
+        cache = results[name]['asset cache']
+        print(f'{"":30} asset cache hits {cache["hits"]}  misses {cache["misses"]}  evictions {cache["evictions"]}')
+        pool = results[name].get('projectile pool')
+        if pool:
+            print(f'{"":30} projectile pool {"  ".join(f"{key} {value}" for key, value in pool.items())}')
+        pairs = results[name].get('pairs tested')
+        if pairs:
+            print(f'{"":30} pairs tested {"  ".join(f"{key} {value}" for key, value in pairs.items())}')
+
+    try:
+        with open(str(PATH_BASELINE)) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    if args.save:
+        baseline.update(results)
+        with open(str(PATH_BASELINE), 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f'Saved the baseline to {PATH_BASELINE}')
+        return 0
+
+    found = []
+    for name, result in results.items():
+        found += regressions(name, result, baseline.get(name, {}), args.tolerance)
+    for regression in found:
+        print(f'REGRESSION {regression}')
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
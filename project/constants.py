@@ -1,17 +1,29 @@
 from pathlib import PurePath
-from random import randint
 
-import pygame as pg
-pg.mixer.init()
+from project.simulation import rng
 
 # Frame rate options
 MIN_FPS = False
-SHOW_FPS = True
+SHOW_FPS = False  # True starts every game with the frame profiler overlay showing, like --profile. F3 toggles it
 FPS = 60
 
+# Frames the profiler overlay takes its percentiles over
+PROFILER_WINDOW = 240
+# Frames between two updates of the profiler overlay's numbers
+PROFILER_REFRESH = 15
+# Waves in a row a group has to grow in before the leak detector reports it
+LEAK_WAVES = 5
+
 if MIN_FPS:
     FPS = 30
 
+# Simulation steps per second, independent of the frame rate. Every speed in the game is per tick, tuned for 60
+TICK_RATE = 60
+# Ticks a frame may run to catch up, past that the game slows down instead of falling further behind
+MAX_TICKS_PER_FRAME = 5
+# Leftover time below which a tick counts as done: milliseconds, against float rounding
+TICK_EPSILON = 1e-6
+
 # Screen options
 Full_Screen = False
 
@@ -28,13 +40,48 @@ if Full_Screen:
     HEIGHT_RATIO = 1080 / HEIGHT
 
 
+# Memory the asset registry may use for decoded images before it starts evicting: bytes
+ASSET_CACHE_LIMIT = 96 * 1024 * 1024
+
+# Seconds the settings wait after the last change before they're written to data.json
+SETTINGS_SAVE_DELAY = 0.5
+
+# Share of the screen that may change before the dirty rect renderer flips the whole frame instead
+DIRTY_RECT_THRESHOLD = 0.35
+
+# Rendered text surfaces kept around for the HUD and menus: entries
+TEXT_CACHE_SIZE = 256
+
+# Threads decoding the gameplay assets while the menus are showing
+PRELOAD_WORKERS = 2
+# Time per menu frame the preloader may spend converting decoded assets on the main thread: seconds
+PRELOAD_BUDGET = 0.008
+
+# Length of the pieces the intro's voice clips are streamed in: seconds
+INTRO_VOICE_CHUNK = 1
+
+# Rotating sprites snap to multiples of this angle, so their rotated images can be shared: degrees
+ROTATION_STEP = 2
+
+
 # Char consts
 MAX_SPEED = 10
 PLAYER_ACC = 1.5
 FIRE_RATE = 250  # interval between shots: milliseconds
 
+# Idle projectiles kept for reuse, per owner type
+PROJECTILE_POOL_SIZE = 256
+# Projectiles built before the game starts, per owner type: 1 -> Character, 5 -> double shot, 4 -> Fighter,
+# 6 -> Structure
+PROJECTILE_POOL_PREALLOC = {1: 32, 5: 16, 4: 64, 6: 64}
+
+# Side of a collision grid cell: pixels
+COLLISION_CELL_SIZE = 128
+
+POWERUP_HEAL = (15, 30)  # Hp range of the red powerup, rolled once per session
+
 POWERUP_EFFECT = {
-    'red': randint(15, 30),  # Hp
+    'red': rng.randint(*POWERUP_HEAL),  # Hp
     'pink': 100,    # Full hp - don't change
     'purple': 15,   # double shot - seconds
     'blue': None,    # Full shield - don't change
@@ -62,7 +109,9 @@ PATH_PROJECT = PurePath(__file__).parent
 PATH_SPRITES = PurePath(PATH_PROJECT).joinpath('sprites/')
 PATH_ASSETS = PurePath(PATH_PROJECT).joinpath('assets/')
 PATH_IMAGES = PurePath(PATH_PROJECT).joinpath('assets/images')
+PATH_SLIDES = PurePath(PATH_PROJECT).joinpath('assets/images/slides')
 PATH_FONTS = PurePath(PATH_PROJECT).joinpath('assets/fonts')
+PATH_ATLAS = PurePath(PATH_PROJECT).joinpath('assets/atlas')
 
 PATH_MENUS = PurePath(PATH_PROJECT).joinpath('ui/')
 PATH_GUI = PurePath(PATH_PROJECT).joinpath('assets/gui')
@@ -95,6 +144,7 @@ BUTTONSHEET = 'buttonsheet.png'
 BACKGROUND = 'background.png'
 BACKGROUND_2 = 'background2.png'
 BACKGROUND_3 = 'background3.png'
+BACKGROUND_STARS = 'stars2.png'
 VOLUME = 'volume.png'
 VOLUME_NO = 'novolume.png'
 BACK_BUTTON = 'back.png'
@@ -118,4 +168,4 @@ DEFAULT_FONT_NAME = 'LiberationMono-Regular.ttf'
 CHARACTER_SPACESHIP = 'own_spaceship.png'
 INVISIBLE = (8, 8), (0, 0), ((0,) * 8), ((0,) * 8)  # invisible cursor
 
-HOVER_SOUND = pg.mixer.Sound(str(PurePath(PATH_FX).joinpath('hover.wav')))
+HOVER_SOUND = 'hover.wav'
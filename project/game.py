@@ -2,64 +2,174 @@ from pathlib import PurePath
 
 import pygame as pg
 
-from project.constants import Color, DEFAULT_FONT_NAME, FPS, HEIGHT, INVISIBLE, PATH_FX, WIDTH
-from project.gameplay.intro import Intro, json_load
+from project import simulation
+from project.constants import BACKGROUND_STARS, COLLISION_CELL_SIZE, Color, DEFAULT_FONT_NAME, DIRTY_RECT_THRESHOLD, \
+    FPS, HEIGHT, INVISIBLE, MAX_TICKS_PER_FRAME, PATH_FONTS, PATH_FX, POWERUP_EFFECT, POWERUP_HEAL, PRELOAD_BUDGET, \
+    PRELOAD_WORKERS, PROFILER_REFRESH, PROFILER_WINDOW, PROJECTILE_POOL_PREALLOC, PROJECTILE_POOL_SIZE, SHOW_FPS, \
+    TICK_EPSILON, TICK_RATE, WIDTH
+from project.gameplay.intro import Intro
+from project.gameplay.leaks import LeakDetector
+from project.gameplay.replay import LiveInput
+from project.preloader import Preloader
+from project.resources import registry
+from project.settings import settings
 from project.sprites.character import Character
+from project.sprites.ecs import World
+from project.sprites.projectile_engine import ENEMY, PLAYER, ProjectileEngine
+from project.sprites.projectile_pool import ProjectilePool
+from project.sprites.spatial_hash import SpatialHash
+from project.sprites.sprite_internals import PhysicsBatch
+from project.startup import trace
 from project.ui.about import About
+from project.ui.atlas import atlas
 from project.ui.background import Background
+from project.ui.character_interface import HealthbarRenderer, StaticHealthbar
+from project.ui.dirty import DirtyRenderer
 from project.ui.main_menu import Home
 from project.ui.options import Options
+from project.ui.profiler import FrameProfiler
 from project.ui.score import ScoreDisplay
+from project.ui.text import digit_atlas, fonts, texts
 from project.ui.timer import Timer
 from project.ui.volume import get_volume
 from project.wave_generator import WaveGenerator
 
 
-class CustomGroup:
+class WidgetGroup:
     """
-    Imitates pg.sprite.Group(). It's main functionality is to handle every draw and update call for non
-    Sprite class that do have and need any of those methods.
+    Imitates pg.sprite.Group() for the elements that aren't sprites (background, HUD, wave generator), updating and
+    drawing them every frame.
+
+    Their update, draw and dirty_rects methods are bound once when they're added. Elements with an expired property
+    are removed once it's true after an update, anything can be taken out with remove(). The lists are replaced
+    rather than changed, so elements can come and go while the group is updating.
     """
+
     def __init__(self):
         self.elements = []
+        self.updates = []
+        self.draws = []
+        self.rects = []
+        self.expiring = []
 
     def __len__(self):
         return len(self.elements)
 
-    def __repr__(self):
-        return f'{self.elements}'
+    def __contains__(self, element):
+        return element in self.elements
 
-    def add(self, element):
-        self.elements.append(element)
+    def __iter__(self):
+        return iter(self.elements)
 
-    def draw(self):
-        for element in self.elements:
-            if hasattr(element, 'draw'):
-                element.draw()
+    def __repr__(self):
+        return f'{self.elements}'
 
-    def update(self):
-        for element in self.elements:
-            if hasattr(element, 'update'):
-                element.update()
+    def add(self, element) -> None:
+        self.elements = self.elements + [element]
+        if hasattr(element, 'update'):
+            self.updates = self.updates + [element.update]
+        if hasattr(element, 'draw'):
+            self.draws = self.draws + [element.draw]
+            # None when the element can't tell what it drew
+            self.rects = self.rects + [getattr(element, 'dirty_rects', None)]
+        if hasattr(type(element), 'expired'):
+            self.expiring = self.expiring + [element]
+
+    def remove(self, element) -> None:
+        if element not in self.elements:
+            return
+        self.elements = [other for other in self.elements if other is not element]
+        self.updates = [method for method in self.updates if method.__self__ is not element]
+        draws = [(draw, rects) for draw, rects in zip(self.draws, self.rects) if draw.__self__ is not element]
+        self.draws = [draw for draw, _rects in draws]
+        self.rects = [rects for _draw, rects in draws]
+        self.expiring = [other for other in self.expiring if other is not element]
+
+    def update(self) -> None:
+        for update in self.updates:
+            update()
+        for element in self.expiring:
+            if element.expired:
+                self.remove(element)
+
+    def draw(self) -> None:
+        for draw in self.draws:
+            draw()
+
+    def dirty_rects(self):
+        """
+        Rects every element drew on in its last draw call, None if an element can't tell.
+        """
+        rects = []
+        for element_rects in self.rects:
+            if element_rects is None:
+                return None
+            rects.extend(element_rects())
+        return rects
 
 
 class Game:
     """
     Main Game class that controls and
+
+    Call simulation.configure() before importing this module to run it headless, see __main__.py
     """
 
-    def __init__(self):
-        pg.init()
-        pg.mixer.music.load(str(PurePath(PATH_FX).joinpath("song.mp3")))
-        pg.mixer.music.play()
-        pg.mouse.set_cursor(*INVISIBLE)
+    def __init__(self, frame_limit: int = None, array_projectiles: bool = False, dirty_rects: bool = False,
+                 tick_rate: float = TICK_RATE, profile: bool = None, controls=None, leak_check: bool = False,
+                 ecs: bool = False, batch_physics: bool = False):
+        """
+        :param frame_limit: stop playing after this many frames, None plays until the window is closed
+        :param array_projectiles: simulate projectiles with the numpy ProjectileEngine instead of sprites
+        :param dirty_rects: update only the changed parts of the display, see DirtyRenderer. The background doesn't
+            scroll then, for machines where pushing the whole frame to the display is what's slow
+        :param tick_rate: simulation ticks per second, the game plays at its normal speed at TICK_RATE
+        :param profile: time the frames and show the profiler overlay, None only does if SHOW_FPS is set and the game
+            isn't headless. F3 toggles it while playing
+        :param controls: where the keys come from every tick, LiveInput (the keyboard) by default, see
+            gameplay/replay.py. The game ends once it runs out of keys
+        :param leak_check: log what outlives its owner and groups that keep growing, see LeakDetector
+        :param ecs: keep the entities' components in the numpy arrays of a World and update them with its systems,
+            see sprites/ecs.py
+        :param batch_physics: move the sprites together in numpy arrays instead of one by one, see PhysicsBatch. They
+            end up exactly where they would one by one
+        """
+        with trace.phase('pg.init()'):
+            pg.init()
+        if not simulation.headless:
+            pg.mouse.set_cursor(*INVISIBLE)
+        settings.subscribe(self._apply_volume, 'volume', 'mute')
+
+        # Rolled again so the session only depends on the seed, not on when constants got imported
+        POWERUP_EFFECT['red'] = simulation.rng.randint(*POWERUP_HEAL)
 
         self.running = True
         self.playing = True
         self.pause = True
 
-        self.screen = pg.display.set_mode((WIDTH, HEIGHT))
-        self.clock = pg.time.Clock()
+        with trace.phase('pg.display.set_mode()'):
+            self.screen = pg.display.set_mode((WIDTH, HEIGHT))
+        self.clock = simulation.clock
+        self.frame = 0
+        self.frame_limit = frame_limit
+        self.tick = 0
+        self.tick_time = 1000 / tick_rate
+        # Simulated time the rendered frames are ahead of the ticks: milliseconds, never positive
+        self.lag = 0
+        # Where the frame is drawn between the tick before the last one (0) and the last one (1)
+        self.interpolation = 1
+        self.previous = {}
+        if profile is None:
+            profile = SHOW_FPS and not simulation.headless
+        self.profiler = FrameProfiler(PROFILER_WINDOW, PROFILER_REFRESH) if profile else None
+        self.controls = LiveInput() if controls is None else controls
+        self.keys = None
+        self.leak_check = leak_check
+        self.array_projectiles = array_projectiles
+        self.ecs = ecs
+        self.world = None
+        self.physics = PhysicsBatch() if batch_physics else None
+        self.dirty_rects = dirty_rects
         self.font = pg.font.get_default_font()
 
         self.mouse_x = 0
@@ -67,13 +177,32 @@ class Game:
 
         self.score = 0
 
-        
+        self.preloader = Preloader(PRELOAD_WORKERS)
+        self._plan_preload()
+
         pg.display.set_caption('LAST JUDGMENT')
 
+    def _plan_preload(self) -> None:
+        """
+        Everything new() loads, prepared in the background while the menus and the intro are showing.
+        """
+        self.preloader.add(lambda: Background.load_image(BACKGROUND_STARS), Background.path(BACKGROUND_STARS))
+        self.preloader.add(StaticHealthbar.load_images, *StaticHealthbar.paths)
+        self.preloader.add(Character.load_images, atlas.file)
+        self.preloader.add(WaveGenerator.preload, *WaveGenerator.preload_files())
+        for size in (50, 30):  # Timer, ScoreDisplay
+            self.preloader.add(lambda size=size: digit_atlas(self._hud_font(size), Color.white))
+
+    @staticmethod
+    def _hud_font(size: int) -> pg.font.Font:
+        return fonts.get(str(PurePath(PATH_FONTS).joinpath(DEFAULT_FONT_NAME)), size)
+
     def new(self):
         """
         Every time a new game starts
         """
+        with trace.phase('waiting for the preloader'):
+            self.preloader.wait()
 
         self.all_sprites = pg.sprite.Group()
         self.mines = pg.sprite.Group()
@@ -82,27 +211,80 @@ class Game:
         self.others = pg.sprite.Group()
         self.enemy_projectiles = pg.sprite.Group()
 
-        self.nonsprite = CustomGroup()
+        self.nonsprite = WidgetGroup()
+        self.world = World(self) if self.ecs else None
+
+        # Collision broadphase, one grid per group that gets checked against
+        self.others_grid = SpatialHash(COLLISION_CELL_SIZE)
+        self.enemy_projectiles_grid = SpatialHash(COLLISION_CELL_SIZE)
+        self.mines_grid = SpatialHash(COLLISION_CELL_SIZE)
+
+        self.projectile_pool = ProjectilePool(self, PROJECTILE_POOL_SIZE)
+        if self.array_projectiles:
+            self.projectile_engine = ProjectileEngine(self)
+        else:
+            self.projectile_engine = None
+            for owner_type, count in PROJECTILE_POOL_PREALLOC.items():
+                self.projectile_pool.preallocate(owner_type, count)
 
-        self.background = Background('stars2.png', self, 5)
+        self.renderer = DirtyRenderer(self.screen, DIRTY_RECT_THRESHOLD) if self.dirty_rects else None
+        self.healthbars = HealthbarRenderer(self.screen, self.world)
 
-        self.devchar = Character(self, 100, 10, friction=-0.052, shield=50)
+        # The scrolling starfield changes the whole screen every frame, it stands still when only changes are updated
+        self.background = Background(BACKGROUND_STARS, self, 0 if self.dirty_rects else 5)
+
+        self.devchar = self.kind(Character)(self, 100, 10, friction=-0.052, shield=50)
 
         self.timer = Timer(self, 600, WIDTH // 2 - 70, 25, DEFAULT_FONT_NAME, 50)
         self.score_display = ScoreDisplay(self, WIDTH - 160, 20, DEFAULT_FONT_NAME, 30)
 
+        # Before the wave generator, so it looks at the game between two waves
+        self.leak_detector = LeakDetector(self) if self.leak_check else None
         self.wave_generator = WaveGenerator(self)
 
         # TODO WITH SPREADSHEET IMAGE LOAD WON'T BE HERE, BUT IN EVERY SPRITE CLASS
         self._run()
 
     def _run(self)-> None:
+        """
+        Fixed timestep loop: the simulation runs in ticks of tick_time, however long the frames take.
+
+        Every frame runs as many ticks as the time since the last frame covers, at most MAX_TICKS_PER_FRAME (any
+        longer and the game slows down instead of running behind forever). The frame is then drawn interpolated
+        between the last two ticks, at the point in time it's actually showing.
+        """
+        # Don't count the time spent in the menus
+        self.clock.tick()
+        self.lag = 0
 
         while self.playing:
-            self.clock.tick(FPS)
+            self.lag = min(self.lag + self.clock.tick(FPS), MAX_TICKS_PER_FRAME * self.tick_time)
+            if self.profiler is not None:
+                self.profiler.begin()
             self._events()
-            self._update()
+            if self.profiler is not None:
+                self.profiler.mark('events')
+
+            while self.lag > TICK_EPSILON:
+                self.keys = self.controls.read()
+                if self.keys is None:
+                    self.running = self.playing = False
+                    break
+                self.lag -= self.tick_time
+                if self.lag < -TICK_EPSILON:
+                    # The last tick of the frame, which is only drawn part of the way
+                    self._snapshot()
+                simulation.advance(self.tick_time)
+                self._update()
+                self.tick += 1
+
+            self.interpolation = 1 + self.lag / self.tick_time if self.lag < -TICK_EPSILON else 1
             self._draw()
+            self._first_frame()
+
+            self.frame += 1
+            if self.frame_limit is not None and self.frame >= self.frame_limit:
+                self.running = self.playing = False
 
     def _events(self)-> None:
         """
@@ -111,40 +293,107 @@ class Game:
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 self.running = self.playing = False
+            if event.type == pg.KEYDOWN and event.key == pg.K_F3:
+                self.toggle_profiler()
+
+    def toggle_profiler(self) -> None:
+        """
+        Shows the profiler overlay, or hides it and stops timing the frames.
+        """
+        if self.profiler is None:
+            self.profiler = FrameProfiler(PROFILER_WINDOW, PROFILER_REFRESH)
+            self.profiler.begin()
+        else:
+            self.profiler = None
+            if self.renderer is not None:
+                self.renderer.invalidate()
 
     def _update(self)-> None:
         """
         Every sprite's update will be registered here
         """
 
-        self.all_sprites.update()
+        # Before the sprites, so projectiles fired this frame first move next frame, like Projectile sprites do
+        if self.projectile_engine is not None:
+            self.projectile_engine.update()
+
+        if self.world is not None:
+            self.world.update()
+        elif self.physics is not None:
+            self.physics.update(self.all_sprites)
+        else:
+            self.all_sprites.update()
         self.nonsprite.update()
 
+        if self.profiler is not None:
+            self.profiler.mark('update')
+        self._collide()
+        if self.profiler is not None:
+            self.profiler.mark('collide')
+
+    def _snapshot(self) -> None:
+        """
+        Keeps where everything is before a tick, for the frame to be drawn in between.
+        """
+        self.previous = {sprite: sprite.rect.topleft for sprite in self.all_sprites}
+        if self.projectile_engine is not None:
+            self.projectile_engine.snapshot()
+
+    def _interpolate(self) -> list:
+        """
+        Moves the sprites' rects to where they are at self.interpolation, returns what has to be moved back.
+        """
+        moved = []
+        if self.interpolation == 1:
+            return moved
+        t = self.interpolation
+        for sprite in self.all_sprites:
+            previous = self.previous.get(sprite)
+            if previous is None:
+                continue
+            rect = sprite.rect
+            moved.append((rect, rect.topleft))
+            rect.topleft = (round(previous[0] + (rect.x - previous[0]) * t),
+                            round(previous[1] + (rect.y - previous[1]) * t))
+        return moved
+
+    def _collide(self) -> None:
+        """
+        Every collision check of the frame, after everything moved
+        """
+        if self.projectile_engine is None:
+            self.others_grid.rebuild(self.others)
+            self.enemy_projectiles_grid.rebuild(self.enemy_projectiles)
+        self.mines_grid.rebuild(self.mines)
+
         for enemy in self.enemy_sprites:
-            projectile_hit = pg.sprite.spritecollide(enemy, self.others, False)
-            if projectile_hit:
-                projectile_hit_mask = pg.sprite.spritecollide(enemy, self.others, False, pg.sprite.collide_mask)
-                for projectile in projectile_hit_mask:
-                    enemy.damage(projectile)
-                    projectile.destroy()
+            for projectile in self._projectile_hits(enemy, self.others_grid, PLAYER):
+                enemy.damage(projectile)
+                projectile.destroy()
+        if self.world is not None:
+            self.world.apply_damage()
         powerup_hit = pg.sprite.spritecollide(self.devchar, self.powerups, True, pg.sprite.collide_mask)
 
         if powerup_hit:
             powerup_hit[0].apply_powerup(self.devchar)
 
-        enemy_projectiles_hit = pg.sprite.spritecollide(self.devchar, self.enemy_projectiles, False)
-        if enemy_projectiles_hit:
-            enemy_projectiles_hit_mask = pg.sprite.\
-                spritecollide(self.devchar, self.enemy_projectiles, False, pg.sprite.collide_mask)
-            for projectile in enemy_projectiles_hit_mask:
-                self.devchar.damage(projectile)
-                projectile.destroy()
+        for projectile in self._projectile_hits(self.devchar, self.enemy_projectiles_grid, ENEMY):
+            self.devchar.damage(projectile)
+            projectile.destroy()
+        if self.world is not None:
+            self.world.apply_damage()
 
-        mine_hit = pg.sprite.spritecollide(self.devchar, self.mines, False)
-        if mine_hit:
-            mine_hit_mask = pg.sprite.spritecollide(self.devchar, self.mines, True, pg.sprite.collide_mask)
-            if mine_hit_mask:
-                self.devchar.heal(-20)
+        if self.mines_grid.spritecollide(self.devchar, True, pg.sprite.collide_mask):
+            self.devchar.heal(-20)
+
+    def _projectile_hits(self, target: pg.sprite.Sprite, grid: SpatialHash, faction: int) -> list:
+        """
+        Projectiles hitting :param target:, from the group in :param grid: or, with the array engine, of
+        :param faction:
+        """
+        if self.projectile_engine is not None:
+            return self.projectile_engine.collide(target, faction)
+        return grid.spritecollide(target, False, pg.sprite.collide_mask)
 
     def _draw(self)-> None:
         """
@@ -153,40 +402,123 @@ class Game:
         Don't forget that we always draw first then -> pg.display.flip()
         """
         self.nonsprite.draw()
+        moved = self._interpolate()
         self.all_sprites.draw(self.screen)
+        healthbar_rects = self.healthbars.draw()
+        for rect, topleft in moved:
+            rect.topleft = topleft
+        projectile_rects = []
+        if self.projectile_engine is not None:
+            projectile_rects = self.projectile_engine.draw(self.screen, self.interpolation)
+        overlay_rects = []
+        if self.profiler is not None:
+            overlay_rects = self.profiler.draw(self.screen, self.entity_counts(), self.pairs_tested())
+            self.profiler.mark('draw')
+
+        if self.renderer is None:
+            pg.display.flip()
+        else:
+            rects = self.nonsprite.dirty_rects()
+            if rects is not None:
+                rects.extend(self.all_sprites.spritedict.values())
+                rects.extend(healthbar_rects)
+                rects.extend(projectile_rects)
+                rects.extend(overlay_rects)
+            self.renderer.present(rects)
+        if self.profiler is not None:
+            self.profiler.mark('flip')
+
+    def kind(self, cls: type) -> type:
+        """
+        The class to create entities of :param cls: with, its adapter when the entities live in a World.
+        """
+        return cls if self.world is None else self.world.adapter(cls)
 
-        pg.display.flip()
+    def entity_counts(self) -> dict:
+        """
+        Live entities per group, for the profiler overlay
+        """
+        counts = {'enemies': len(self.enemy_sprites), 'others': len(self.others),
+                  'enemy projectiles': len(self.enemy_projectiles), 'mines': len(self.mines),
+                  'powerups': len(self.powerups), 'nonsprite': len(self.nonsprite), 'healthbars': len(self.healthbars)}
+        if self.projectile_engine is not None:
+            counts['array projectiles'] = len(self.projectile_engine)
+        if self.world is not None:
+            counts['world rows'] = len(self.world)
+        return counts
+
+    def pairs_tested(self, total: bool = False) -> dict:
+        """
+        Rect tests done by every collision grid in the last tick, or since the game started with :param total:, for
+        the profiler overlay and the benchmarks
+        """
+        grids = {'others': self.others_grid, 'enemy projectiles': self.enemy_projectiles_grid,
+                 'mines': self.mines_grid}
+        return {name: grid.total_pairs_tested if total else grid.pairs_tested for name, grid in grids.items()}
 
     def _destroy(self)-> None:
         self.kill()
         # TODO show end screen
 
-    def play_intro(self):
-        DATA = json_load()
+    @staticmethod
+    def _apply_volume() -> None:
+        """
+        Gets called by the settings every time the volume changes
+        """
+        volume = get_volume()
+        pg.mixer.music.set_volume(volume)
+        for sound in registry.sounds.values():
+            sound.set_volume(volume)
 
-        if DATA['intro_played']:
+    def play_intro(self):
+        if settings['intro_played']:
             return
         else:
             intro = Intro(self.screen)
 
             while intro.playing and self.running:
                 intro.play()
+                self.preloader.poll(PRELOAD_BUDGET)
                 self.clock.tick(FPS/2)
 
                 for event in pg.event.get():
                     if event.type == pg.QUIT:
                         intro.playing = self.running = False
+                        intro.release()
 
     def show_start_screen(self):
-        self.homepage = Home(self.screen)
+        self.draw_start_screen()
         self._wait_for_input()
 
+    def draw_start_screen(self) -> None:
+        """
+        Draws the main menu once, the first frame when the game isn't headless.
+        """
+        with trace.phase('main menu'):
+            self.homepage = Home(self.screen)
+            self.homepage.draw()
+        self._first_frame()
+
+    def _first_frame(self) -> None:
+        """
+        Ends the startup trace and starts what can wait until something is on the screen, the music.
+        """
+        if trace.done:
+            return
+        trace.finish()
+        self.preloader.start()
+        if not simulation.headless:
+            pg.mixer.music.load(str(PurePath(PATH_FX).joinpath("song.mp3")))
+            pg.mixer.music.play()
+        self._apply_volume()
+
     def _wait_for_input(self)-> None:
         waiting = True
 
         while waiting:
             self.clock.tick(FPS/2)
             self.homepage.draw()
+            self.preloader.poll(PRELOAD_BUDGET)
 
             for event in pg.event.get():
                 if event.type == pg.QUIT:
@@ -196,22 +528,21 @@ class Game:
                 if event.type == pg.MOUSEBUTTONUP and self.homepage.buttons_hover_states['options']:
                     self.options = Options(self.screen)
                     self.running = waiting = self.options.handle_input()
-                    self.homepage.update_volume()
+                    self.homepage.layers.invalidate()
                 if event.type == pg.MOUSEBUTTONUP and self.homepage.buttons_hover_states['about']:
                     self.about = About(self.screen)
                     self.running = waiting = self.about.handle_input()
+                    self.homepage.layers.invalidate()
                 if event.type == pg.MOUSEBUTTONUP and self.homepage.buttons_hover_states['gitlab']:
                     self.homepage.open_gitlab()
                 if event.type == pg.MOUSEBUTTONUP and self.homepage.buttons_hover_states['exit']:
                     self.running = self.playing = waiting = False
-            pg.mixer.music.set_volume(get_volume())
 
     def draw_text(self, text: str, size: int, color: Color, x: int, y: int)-> None:
         """
         Draws basic text in the screen
         """
-        font = pg.font.Font(self.font, size)
-        text_surface = font.render(text, True, color)
+        text_surface = texts.render(fonts.get(self.font, size), text, color)
         text_rect = text_surface.get_rect()
         text_rect.midtop = (x, y)
         self.screen.blit(text_surface, text_rect)
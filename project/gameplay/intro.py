@@ -1,21 +1,76 @@
-import json
+import io
 import os
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import PurePath
 
 import pygame as pg
 
-from project.constants import HEIGHT, PATH_IMAGES, PATH_PROJECT, PATH_VOICES, WIDTH
-from project.ui.sheet import Sheet
+from project.constants import Color, INTRO_VOICE_CHUNK, PATH_SLIDES, PATH_VOICES
+from project.resources import registry
+from project.settings import settings
 from project.ui.volume import get_volume
 
 
-def json_load():
-    with open(str(PurePath(PATH_PROJECT).joinpath('data.json'))) as f:
-        DATA = json.load(f)
-    return DATA
+class VoiceStream:
+    """
+    Plays a wav file on a channel of its own, decoding only :param chunk: seconds of it at a time.
+
+    feed() has to be called every frame, it starts playing and queues the next chunk once the channel has room for it.
+    """
+
+    def __init__(self, path: str, chunk: float):
+        self.file = wave.open(path, 'rb')
+        self.frames_per_chunk = int(self.file.getframerate() * chunk)
+        self.length = self.file.getnframes() / self.file.getframerate()
+        self.channel = None
+
+    def feed(self) -> None:
+        if self.file is None:
+            return
+        if self.channel is None:
+            self.channel = pg.mixer.find_channel(True)
+        elif self.channel.get_queue() is not None:
+            return
+        chunk = self._read()
+        if chunk is None:
+            self.close()
+        else:
+            # Starts right away on an idle channel, after the current chunk otherwise
+            self.channel.queue(chunk)
+
+    def _read(self):
+        frames = self.file.readframes(self.frames_per_chunk)
+        if not frames:
+            return None
+        # Wrapped back into a wav, so SDL converts it to the mixer's format
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as chunk:
+            chunk.setparams(self.file.getparams())
+            chunk.writeframes(frames)
+        buffer.seek(0)
+        sound = pg.mixer.Sound(file=buffer)
+        sound.set_volume(get_volume())
+        return sound
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def stop(self) -> None:
+        if self.channel is not None:
+            self.channel.stop()
+        self.close()
 
 
 class Intro:
+    """
+    The slideshow with voice over that plays before the first game.
+
+    Only the slide on the screen and the next one are in memory, the next one gets decoded on a worker thread while
+    the current one shows. The voice clips are streamed. Everything is released once the intro is over.
+    """
 
     def __init__(self, screen: pg.Surface):
 
@@ -23,53 +78,73 @@ class Intro:
         self.screen = screen
         self.playing = True
 
-        self.slides_sheet = Sheet(str(PurePath(PATH_IMAGES).joinpath('slidesheet.png')))
-        self.slides = [self.slides_sheet.get_image(0, HEIGHT * i, WIDTH, HEIGHT) for i in range(0, 3)]
-
-        self.voice_clips = [pg.mixer.Sound(str(PurePath(PATH_VOICES).joinpath(i)))
-                            for i in os.listdir(str(PurePath(PATH_VOICES)))]
+        self.slide_paths = [str(PurePath(PATH_SLIDES).joinpath(i)) for i in sorted(os.listdir(str(PATH_SLIDES)))]
+        self.voice_paths = [str(PurePath(PATH_VOICES).joinpath(i)) for i in sorted(os.listdir(str(PATH_VOICES)))]
 
-        volume = get_volume()
-        self.voice_clips[0].set_volume(volume)
-        self.voice_clips[1].set_volume(volume)
-        self.voice_clips[2].set_volume(volume)
-
-        self.durations = [i.get_length() for i in self.voice_clips]
-        self.durations[0] += 1.5
+        self.loader = ThreadPoolExecutor(1, thread_name_prefix='intro')
+        self.next_slide = self.loader.submit(pg.image.load, self.slide_paths[0])
+        self.slide = None
+        self.voice = None
 
         self.start_time = pg.time.get_ticks()
-        self.index = 0
-        self.once = True
+        self.index = -1
+        self._next()
+
+    def _next(self) -> None:
+        """
+        Shows the next slide with its voice clip and starts decoding the one after it.
+        """
+        self.index += 1
+        if self.voice is not None:
+            self.voice.stop()
+
+        self.slide = self._cut(self.next_slide.result(), self.slide_paths[self.index])
+        if self.index + 1 < len(self.slide_paths):
+            self.next_slide = self.loader.submit(pg.image.load, self.slide_paths[self.index + 1])
+        else:
+            self.next_slide = None
+
+        self.voice = VoiceStream(self.voice_paths[self.index], INTRO_VOICE_CHUNK)
+        self.duration = self.voice.length
+        if self.index == 0:
+            self.duration += 1.5
+
+    @staticmethod
+    def _cut(image: pg.Surface, name: str) -> pg.Surface:
+        """
+        The slide on black, black is transparent in it like in Sheet.get_image
+        """
+        slide = pg.Surface(image.get_size())
+        slide.blit(image, (0, 0))
+        slide.set_colorkey(Color.black)
+        return registry.optimize(slide.convert_alpha(), name)
 
     def play(self):
 
         current_time = (pg.time.get_ticks() - self.start_time) / 1000
 
-        if current_time > self.durations[self.index]:
-            self.index += 1
+        if current_time > self.duration:
+            if self.index + 1 == len(self.slide_paths):
+                self.playing = False
+                self._played()
+                return
+            self._next()
             self.start_time = pg.time.get_ticks()
-            self.once = True
-
-        if self.index == 3:
-            self.playing = False
-            self._played()
-            return
 
-        if self.once:
-            self.voice_clips[self.index].play()
-            self.once = False
+        self.voice.feed()
 
-        self.screen.blit(self.slides[self.index], (0, 0))
+        self.screen.blit(self.slide, (0, 0))
         pg.display.flip()
 
     def _played(self):
-        import json
-
-        file = str(PurePath(PATH_PROJECT).joinpath('data.json'))
-
-        with open(file, 'r') as f:
-            data = json.load(f)
-            data['intro_played'] = True
-
-        with open(file, 'w') as f:
-            json.dump(data, f)
+        self.release()
+        settings.update(intro_played=True)
+
+    def release(self) -> None:
+        """
+        Stops the voice over and drops the slides, also when the intro is quit halfway.
+        """
+        if self.voice is not None:
+            self.voice.stop()
+        self.loader.shutdown(wait=True, cancel_futures=True)
+        self.slide = self.next_slide = self.voice = None
@@ -0,0 +1,66 @@
+import logging
+import weakref
+
+from project.constants import LEAK_WAVES
+
+logger = logging.getLogger('last_judgment_logger')
+
+
+class LeakDetector:
+    """
+    Debug check for things that outlive what they belong to, run with --leak-check.
+
+    Between two waves (no enemies left) it looks for:
+        * elements with an owner that is dead, unless their type sets outlives_owner (like Projectile)
+        * groups that got bigger at each of the last :param waves: wave starts
+
+    It has to be added to game.nonsprite before the WaveGenerator, to see the game before the next wave spawns.
+    """
+
+    def __init__(self, game, waves: int = LEAK_WAVES):
+        self.game = game
+        self.game.nonsprite.add(self)
+        self.waves = waves
+        self.wave = None
+        self.sizes = []
+        self.reported = weakref.WeakSet()
+        self.leaks = 0
+
+    def update(self) -> None:
+        if self.game.enemy_sprites:
+            return
+        wave = self.game.wave_generator.difficulty
+        if wave == self.wave:
+            return
+        self.wave = wave
+        self._orphans()
+        self._growth()
+
+    def containers(self) -> dict:
+        """
+        Sizes of everything the detector watches
+        """
+        return {'all sprites': len(self.game.all_sprites), **self.game.entity_counts()}
+
+    def _orphans(self) -> None:
+        for group in (self.game.all_sprites, self.game.nonsprite, self.game.healthbars):
+            for element in group:
+                owner = getattr(element, 'owner', None)
+                if owner is None or owner.alive() or getattr(element, 'outlives_owner', False):
+                    continue
+                if element not in self.reported:
+                    self.reported.add(element)
+                    self.leaks += 1
+                    logger.warning(f'Leak before wave {self.wave}: {type(element).__name__} '
+                                   f'of a dead {type(owner).__name__}')
+
+    def _growth(self) -> None:
+        self.sizes = (self.sizes + [self.containers()])[-self.waves - 1:]
+        if len(self.sizes) <= self.waves:
+            return
+        for name, size in self.sizes[-1].items():
+            history = [sizes.get(name, 0) for sizes in self.sizes]
+            if all(before < after for before, after in zip(history, history[1:])):
+                self.leaks += 1
+                logger.warning(f'Leak before wave {self.wave}: {name} grew in each of the last {self.waves} waves '
+                               f'({" -> ".join(str(size) for size in history)})')
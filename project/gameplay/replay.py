@@ -0,0 +1,98 @@
+import json
+import logging
+import struct
+import zlib
+
+import pygame as pg
+
+logger = logging.getLogger('last_judgment_logger')
+
+MAGIC = b'LJREPLAY1\n'
+# The keys Character reacts to, one bit each in the recording
+KEYS = (pg.K_UP, pg.K_w, pg.K_DOWN, pg.K_s, pg.K_LEFT, pg.K_a, pg.K_RIGHT, pg.K_d, pg.K_SPACE)
+# Ticks the keys stayed the same, the keys as bits. The runs are stored zlib compressed
+RUN = struct.Struct('<IH')
+
+
+class KeyState:
+    """
+    Pressed keys, indexed like pg.key.get_pressed()
+    """
+
+    def __init__(self, mask: int):
+        self.mask = mask
+
+    def __getitem__(self, key: int) -> bool:
+        return key in KEYS and bool(self.mask & 1 << KEYS.index(key))
+
+    @staticmethod
+    def encode(pressed) -> int:
+        return sum(1 << bit for bit, key in enumerate(KEYS) if pressed[key])
+
+
+class LiveInput:
+    """
+    The keyboard, what Game plays with unless it replays a recording.
+    """
+
+    def read(self):
+        """
+        The keys for the next tick, None once there are no more.
+        """
+        return pg.key.get_pressed()
+
+
+class Recorder(LiveInput):
+    """
+    Plays with the keyboard and records what's pressed every tick, to be written to :param path: by save().
+
+    Together with the seed and the options the simulation depends on (:param header:) that's all it takes to play
+    the session again tick for tick, see Replay.
+    """
+
+    def __init__(self, path: str, header: dict):
+        self.path = path
+        self.header = header
+        self.runs = []
+
+    def read(self):
+        pressed = super().read()
+        mask = KeyState.encode(pressed)
+        if self.runs and self.runs[-1][1] == mask:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, mask])
+        return pressed
+
+    def save(self) -> None:
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(json.dumps(self.header).encode() + b'\n')
+            f.write(zlib.compress(b''.join(RUN.pack(count, mask) for count, mask in self.runs)))
+        logger.info(f'Recorded {sum(count for count, _mask in self.runs)} ticks to {self.path}')
+
+
+class Replay:
+    """
+    Feeds the keys of a Recorder file back to the game, tick by tick.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a recording')
+            self.header = json.loads(f.readline())
+            data = zlib.decompress(f.read())
+        self.runs = [RUN.unpack_from(data, offset) for offset in range(0, len(data), RUN.size)]
+        self.ticks = sum(count for count, _mask in self.runs)
+        self.run = 0
+        self.left = self.runs[0][0] if self.runs else 0
+
+    def read(self):
+        while self.left == 0:
+            self.run += 1
+            if self.run >= len(self.runs):
+                return None
+            self.left = self.runs[self.run][0]
+        self.left -= 1
+        return KeyState(self.runs[self.run][1])
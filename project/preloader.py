@@ -0,0 +1,114 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import PurePath
+
+import pygame as pg
+
+from project.resources import AssetRegistry, registry
+
+logger = logging.getLogger('last_judgment_logger')
+
+SOUND_EXTENSIONS = ('.wav', '.ogg', '.mp3')
+
+
+def decode(path: str):
+    """
+    Runs on a worker thread: reads and decodes the file, everything that doesn't need the display.
+    """
+    if PurePath(path).suffix in SOUND_EXTENSIONS:
+        return pg.mixer.Sound(path)
+    surface = pg.image.load(path)
+    return surface, AssetRegistry.classify(surface)
+
+
+class Preloader:
+    """
+    Gets assets ready in the background, e.g. the gameplay ones while the menus are showing.
+
+    Each step is a function that loads assets through the registry (like WaveGenerator.preload), together with the
+    files it reads. The files are decoded on a pool of :param workers: threads, the steps themselves (the final
+    convert()) run on the main thread in poll(), a slice of every frame, once their files are decoded.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.executor = None
+        self.futures = {}
+        self.steps = []
+        self.total = 0
+
+    def add(self, step, *files) -> None:
+        self.steps.append((step, [str(file) for file in files]))
+        self.total += 1
+
+    @property
+    def progress(self) -> float:
+        """
+        Share of the steps done, from 0 to 1.
+        """
+        return 1 - len(self.steps) / self.total if self.total else 1
+
+    @property
+    def ready(self) -> bool:
+        return not self.steps
+
+    def start(self) -> None:
+        if self.executor is not None or self.ready:
+            return
+        self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='preloader')
+        for _step, files in self.steps:
+            for file in files:
+                # E.g. the atlas, which the main menu loaded already
+                if file not in self.futures and not registry.decoded(file):
+                    self.futures[file] = self.executor.submit(decode, file)
+
+    def _collect(self) -> None:
+        """
+        Hands the decoded files over to the registry.
+        """
+        for file, future in list(self.futures.items()):
+            if not future.done():
+                continue
+            del self.futures[file]
+            try:
+                registry.stage(file, future.result())
+            except (pg.error, OSError):
+                # The step loads it again and gets the error where it's used
+                logger.exception(f'Could not preload {file}')
+
+    def poll(self, budget: float) -> None:
+        """
+        Runs the steps whose files are decoded, until :param budget: seconds are used up.
+        """
+        if self.executor is None:
+            return
+        deadline = time.perf_counter() + budget
+        self._collect()
+        while self.steps and time.perf_counter() < deadline:
+            step, files = self.steps[0]
+            if any(file in self.futures for file in files):
+                break
+            self.steps.pop(0)
+            step()
+        if self.ready:
+            self._shutdown()
+
+    def wait(self) -> None:
+        """
+        Blocks until everything is loaded, whatever wasn't preloaded yet gets loaded now.
+        """
+        if self.executor is not None:
+            wait(list(self.futures.values()))
+            self._collect()
+        while self.steps:
+            step, _files = self.steps.pop(0)
+            step()
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        # Decoded files no step converted, they'd stay outside the cache's byte limit for the whole session
+        registry.staged.clear()
@@ -0,0 +1,234 @@
+import logging
+from collections import Counter, OrderedDict
+from pathlib import PurePath
+
+import pygame as pg
+
+from project.constants import ASSET_CACHE_LIMIT
+from project.startup import trace
+
+logger = logging.getLogger('last_judgment_logger')
+
+
+class AssetRegistry:
+    """
+    Single entry point for every image the game draws.
+
+    Decoded surfaces are kept in memory, keyed by path, region and scale, so the same file is never read twice
+    while it's cached. Once the cached surfaces take more than :param limit: bytes, the least recently used ones
+    are evicted.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.surfaces = OrderedDict()
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.formats = Counter()
+        self.sounds = {}
+        self.staged = {}
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def image(self, path, region: tuple = None, scale: tuple = None, alpha: bool = None,
+              colorkey: tuple = None) -> pg.Surface:
+        """
+        Returns the (shared) surface for an image file. Don't draw on it or change its colorkey, copy it first.
+
+        Every surface is converted to the display's pixel format by optimize(), which picks opaque, colorkey or
+        per-pixel alpha blitting from what the image actually contains.
+
+        :param path: path of the image file
+        :param region: (x, y, width, height) cut out of the image, black is transparent in it like in Sheet.get_image
+        :param scale: (width, height) the image or region is scaled to
+        :param alpha: False drops the per-pixel alpha of the image, anything else keeps it if it's needed
+        :param colorkey: color that's transparent in the image, like surface.set_colorkey()
+        """
+        key = (str(path), region, scale, alpha is not False, colorkey and tuple(colorkey))
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        with trace.phase(' '.join(str(part) for part in ('image', PurePath(path).name, region, scale) if part)):
+            staged = self.staged.pop(key[0], None) if key[1:] == (None, None, True, None) else None
+            if staged is not None:
+                surface = self._convert(staged[1], key)
+            else:
+                surface = self._create(*key)
+                if colorkey is not None:
+                    surface.set_colorkey(colorkey)
+                surface = self.optimize(surface, key)
+        self._store(key, surface)
+        return surface
+
+    def stage(self, path, decoded) -> None:
+        """
+        Hands over an asset decoded ahead of time (see Preloader), images only get converted once they're used.
+
+        :param decoded: a pg.mixer.Sound, or (the loaded image, its classify() result)
+        """
+        if isinstance(decoded, pg.mixer.Sound):
+            self.sounds.setdefault(str(path), decoded)
+        else:
+            self.staged[str(path)] = decoded
+
+    def decoded(self, path) -> bool:
+        """
+        Whether :param path: needs no decoding anymore: a sound that's loaded or an image whose plain surface is cached.
+        """
+        return str(path) in self.sounds or (str(path), None, None, True, None) in self.surfaces
+
+    def sound(self, path) -> pg.mixer.Sound:
+        """
+        Returns the (shared) pg.mixer.Sound for a sound file, decoded on first use.
+        """
+        sound = self.sounds.get(str(path))
+        if sound is None:
+            with trace.phase(f'sound {PurePath(path).name}'):
+                sound = self.sounds[str(path)] = pg.mixer.Sound(str(path))
+        return sound
+
+    def _create(self, path: str, region: tuple, scale: tuple, alpha: bool, colorkey: tuple) -> pg.Surface:
+        if scale is not None:
+            return pg.transform.scale(self.image(path, region, alpha=alpha), scale)
+
+        if region is not None:
+            # Regions are always cut from the sheet with its alpha, onto black
+            surface = pg.Surface(region[2:])
+            surface.blit(self.image(path), (0, 0), region)
+            surface.set_colorkey((0, 0, 0))
+            # Alpha blits leave the unused byte of the pixels set, which stops them from matching the colorkey,
+            # converting bakes the colorkey into the alpha channel instead
+            return surface.convert_alpha()
+
+        staged = self.staged.pop(path, None)
+        if staged is not None:
+            surface = staged[0]
+        else:
+            logger.debug(f'Decoding {path}')
+            surface = pg.image.load(path)
+        if not alpha:
+            return surface.convert()
+        return surface
+
+    def optimize(self, surface: pg.Surface, name=None) -> pg.Surface:
+        """
+        Converts :param surface: to the display format with the cheapest way to blit it, the decision gets logged.
+
+        opaque: every pixel is visible -> convert()
+        colorkey: pixels are either visible or not -> convert() with a colorkey that no visible pixel has, RLEACCEL
+        alpha: there are translucent pixels -> convert_alpha(), RLEACCEL if most of the image is transparent
+        """
+        return self._convert(self.classify(surface), name)
+
+    @classmethod
+    def classify(cls, surface: pg.Surface) -> tuple:
+        """
+        The pixel analysis of optimize(), it doesn't need the display so it can run on another thread.
+
+        :return: (surface ready to be converted, kind, colorkey, RLE)
+        """
+        width, height = surface.get_size()
+        colorkey = surface.get_colorkey()
+
+        if not surface.get_flags() & pg.SRCALPHA:
+            if colorkey is None:
+                return surface, 'opaque', None, False
+            return surface, 'colorkey', colorkey, True
+
+        # Visible pixels, by alpha and colorkey
+        plain = surface.copy()
+        plain.set_colorkey(None)
+        visible = pg.mask.from_surface(plain, 0)
+        solid = pg.mask.from_surface(plain, 254)
+        if colorkey is not None:
+            keyed = pg.mask.from_threshold(plain, colorkey, (1, 1, 1, 255))
+            visible.erase(keyed, (0, 0))
+            solid.erase(keyed, (0, 0))
+
+        if solid.count() == width * height:
+            return plain, 'opaque', None, False
+
+        if solid.count() == visible.count():
+            key = cls._free_color(plain, solid, colorkey)
+            if key is not None:
+                keyed_surface = pg.Surface((width, height))
+                keyed_surface.fill(key)
+                keyed_surface.blit(plain, (0, 0))
+                return keyed_surface, 'colorkey', key, True
+
+        if colorkey is not None:
+            keyed.to_surface(plain, setcolor=(0, 0, 0, 0), unsetcolor=None)
+        return plain, 'alpha', None, visible.count() < width * height // 2
+
+    def _convert(self, classified: tuple, name=None) -> pg.Surface:
+        surface, kind, colorkey, rle = classified
+        if kind == 'alpha':
+            surface = surface.convert_alpha()
+            if rle:
+                surface.set_alpha(255, pg.RLEACCEL)
+        else:
+            surface = surface.convert()
+            if colorkey is not None:
+                surface.set_colorkey(colorkey, pg.RLEACCEL)
+
+        self.formats[kind] += 1
+        logger.debug(f'{name}: {kind}' + (', RLE' if rle else ''))
+        return surface
+
+    @staticmethod
+    def _free_color(surface: pg.Surface, solid: pg.mask.Mask, colorkey: tuple = None):
+        """
+        A color none of the :param solid: pixels has, to be used as the colorkey.
+        """
+        for color in (colorkey, (0, 0, 0), (255, 0, 255), (0, 255, 0), (1, 2, 3)):
+            if color is None:
+                continue
+            if not solid.overlap_area(pg.mask.from_threshold(surface, color, (1, 1, 1, 255)), (0, 0)):
+                return color
+        return None
+
+    def _store(self, key: tuple, surface: pg.Surface) -> None:
+        self.surfaces[key] = surface
+        self.size += self._bytes(surface)
+
+        while self.size > self.limit and len(self.surfaces) > 1:
+            old_key, old_surface = self.surfaces.popitem(last=False)
+            self.size -= self._bytes(old_surface)
+            self.evictions += 1
+            logger.debug(f'Evicted {old_key} from the asset cache')
+
+    @staticmethod
+    def _bytes(surface: pg.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    def stats(self) -> dict:
+        """
+        Cache statistics, logged when the game quits and reported by the benchmarks.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0,
+            'evictions': self.evictions,
+            'entries': len(self.surfaces),
+            'bytes': self.size,
+            'formats': dict(self.formats)
+        }
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+        self.staged.clear()
+        self.size = 0
+
+
+registry = AssetRegistry(ASSET_CACHE_LIMIT)
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import PurePath
+
+from project.constants import PATH_PROJECT, SETTINGS_SAVE_DELAY
+
+logger = logging.getLogger('last_judgment_logger')
+
+
+class Settings:
+    """
+    The player's settings (data.json), read once and then served from memory.
+
+    Changes notify the subscribers of the changed keys right away and are written back to the file on a background
+    thread, :param delay: seconds after the last change, so dragging the volume switch doesn't write every frame.
+    """
+
+    def __init__(self, path: str, delay: float):
+        self.path = path
+        self.delay = delay
+        self._data = None
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._timer = None
+        # Changed since the last write
+        self._pending = False
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            with open(self.path) as f:
+                self._data = json.load(f)
+        return self._data
+
+    def __getitem__(self, key: str):
+        return self.data[key]
+
+    def volume(self) -> float:
+        """
+        Volume ready for pygame.Sound.set_volume function.
+        """
+        if self['mute']:
+            return 0
+        return self['volume'] / 100
+
+    def subscribe(self, callback, *keys: str) -> None:
+        """
+        Calls :param callback: with no arguments every time one of :param keys: changes.
+        """
+        for key in keys:
+            self._subscribers.setdefault(key, []).append(callback)
+
+    def update(self, **values) -> None:
+        """
+        Changes the given settings, nothing happens for values that are already set.
+        """
+        changed = {key: value for key, value in values.items() if self.data.get(key) != value}
+        if not changed:
+            return
+
+        with self._lock:
+            self.data.update(changed)
+
+        callbacks = []
+        for key in changed:
+            for callback in self._subscribers.get(key, ()):
+                if callback not in callbacks:
+                    callbacks.append(callback)
+        for callback in callbacks:
+            callback()
+
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        with self._lock:
+            self._pending = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.save)
+            self._timer.start()
+
+    def save(self) -> None:
+        """
+        Writes the settings to a temporary file and renames it over the old one, so the file is never half written.
+
+        Does nothing unless they changed since the last write.
+        """
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if self._data is None or not self._pending:
+                    return
+                data = dict(self._data)
+                # Cleared now, a change made while writing needs another write
+                self._pending = False
+
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix='.data-', suffix='.json')
+            try:
+                if os.path.exists(self.path):
+                    os.chmod(temp_path, os.stat(self.path).st_mode)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except OSError:
+                logger.exception(f'Could not save the settings to {self.path}')
+                with self._lock:
+                    self._pending = True
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+
+settings = Settings(str(PurePath(PATH_PROJECT).joinpath('data.json')), SETTINGS_SAVE_DELAY)
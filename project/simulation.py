@@ -0,0 +1,90 @@
+import os
+import random
+
+import pygame as pg
+
+# Every gameplay cooldown and every random roll goes through this module, so that a session can
+# either follow the wall clock (normal play) or a fixed simulated clock with a seeded RNG (headless runs).
+# Gameplay time only moves with the simulation ticks (see Game._run), the clocks pace the rendered frames.
+
+rng = random.Random()
+seed = None
+headless = False
+elapsed = 0.0
+
+
+class WallClock:
+    """
+    Real time clock, throttles the game loop to the requested frame rate.
+    """
+
+    def __init__(self):
+        self._clock = pg.time.Clock()
+
+    def tick(self, fps: float = 0) -> float:
+        """
+        Milliseconds since the last call
+        """
+        return self._clock.tick(fps)
+
+
+class FixedClock:
+    """
+    Simulated clock, every frame takes exactly the same time and it never sleeps.
+    """
+
+    def __init__(self, fps: float):
+        self.frame_time = 1000 / fps
+
+    def tick(self, fps: float = 0) -> float:
+        return self.frame_time
+
+
+clock = WallClock()
+
+
+def get_ticks() -> int:
+    """
+    Milliseconds of gameplay simulated so far, drop-in replacement for pg.time.get_ticks()
+    """
+    return int(elapsed)
+
+
+def advance(milliseconds: float) -> None:
+    """
+    Called once per simulation tick, before anything is updated.
+    """
+    global elapsed
+    elapsed += milliseconds
+
+
+def use_dummy_drivers() -> None:
+    """
+    Makes SDL render and play audio into the void.
+
+    Must be called before pygame (or project.constants, which initializes the mixer) is initialized.
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+
+def configure(is_headless: bool = False, rng_seed: int = None, fps: float = 60) -> None:
+    """
+    Sets up the simulation before a Game is created.
+
+    :param is_headless: dummy SDL drivers and a fixed, unthrottled frame clock
+    :param rng_seed: seeds the shared RNG, None picks a random seed (kept in simulation.seed, to record it)
+    :param fps: simulated frame rate of the fixed clock
+    """
+    global clock, elapsed, headless, seed
+
+    headless = is_headless
+    elapsed = 0.0
+    if headless:
+        use_dummy_drivers()
+        clock = FixedClock(fps)
+    else:
+        clock = WallClock()
+
+    seed = random.randrange(2 ** 32) if rng_seed is None else rng_seed
+    rng.seed(seed)
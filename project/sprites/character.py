@@ -1,20 +1,21 @@
-from collections import deque
-from pathlib import PurePath
 from typing import Union
 
 
 import pygame as pg
 
-from project.constants import CHARACTER_SPACESHIP, Color, FIRE_RATE, PATH_IMAGES, PLAYER_ACC
+from project import simulation
+from project.constants import FIRE_RATE, PLAYER_ACC
 from project.sprites.combat import Combat
 from project.sprites.sprite_internals import Physics
+from project.ui.atlas import atlas
 from project.ui.character_interface import StaticHealthbar
-from project.ui.sheet import Sheet
 
 
 class Character(Combat, Physics, pg.sprite.Sprite):
     """ Main Character Class """
-    path = str(PurePath(PATH_IMAGES).joinpath(CHARACTER_SPACESHIP))
+    # Fighters and structures aim where the player went this tick
+    leads = True
+    colors = {1: 'red', 2: 'blue', 3: 'green', 4: 'yellow', 5: 'orange', 6: 'purple', 7: 'pink', 8: 'black'}
 
     def __init__(
         self,
@@ -38,32 +39,16 @@ class Character(Combat, Physics, pg.sprite.Sprite):
 
         self.image_code = 1
 
-        self.images = {1: pg.transform.scale(
-            Sheet(Character.path).get_image(200, 460, 310, 300, alpha=True), (60, 60)),    # red
-                       2: pg.transform.scale(
-            Sheet(Character.path).get_image(200, 760, 310, 300, alpha=True), (60, 60)),    # blue
-                       3: pg.transform.scale(
-            Sheet(Character.path).get_image(200, 1060, 310, 300, alpha=True), (60, 60)),    # green
-                       4: pg.transform.scale(
-            Sheet(Character.path).get_image(600, 760, 310, 300, alpha=True), (60, 60)),    # yellow
-                       5: pg.transform.scale(
-            Sheet(Character.path).get_image(600, 1060, 310, 300, alpha=True), (60, 60)),   # orange
-                       6: pg.transform.scale(
-            Sheet(Character.path).get_image(900, 760, 310, 300, alpha=True), (60, 60)),    # purple
-                       7: pg.transform.scale(
-            Sheet(Character.path).get_image(900, 1060, 310, 300, alpha=True), (60, 60)),   # pink
-                       8: pg.transform.scale(
-            Sheet(Character.path).get_image(1250, 1060, 310, 300, alpha=True), (60, 60))}  # black
+        self.images = Character.load_images()
 
         self.image = self.images[1]
-        self.image.set_colorkey(Color.black)
 
         self.player_acc = PLAYER_ACC
         self.fire_rate = FIRE_RATE
         self.health = health
         self.shield = shield
         self.defense = defence
-        self.projectiles = deque()
+        self.projectiles = set()
         self.type = 1
 
         self.fire_rate -= 20
@@ -93,13 +78,18 @@ class Character(Combat, Physics, pg.sprite.Sprite):
             self.vel = vel
 
         self.friction = friction
-
-        self.image.set_colorkey(Color.green)
         self.pos = pg.Vector2(500, 500)
 
         self.healthbar = StaticHealthbar(self.game, self, 70, 40)
         self.mask = pg.mask.from_surface(self.image)
 
+    @staticmethod
+    def load_images() -> dict:
+        """
+        Gets the character's image of every color from the atlas, also used to preload them.
+        """
+        return {code: atlas.image(f'character_{color}') for code, color in Character.colors.items()}
+
     def heal(self, amount: int)-> None:
         """
         Heals :param amount
@@ -123,7 +113,7 @@ class Character(Combat, Physics, pg.sprite.Sprite):
         """
         During :param duration seconds the character shots two projectiles instead of one.
         """
-        self.double_shot_time = pg.time.get_ticks()
+        self.double_shot_time = simulation.get_ticks()
         self.type = 5
         self.double_s = True
         self.double_shot_duration = duration
@@ -133,7 +123,7 @@ class Character(Combat, Physics, pg.sprite.Sprite):
         """
         During :param duration: seconds the character cannot receive any damage
         """
-        self.immune_time = pg.time.get_ticks()
+        self.immune_time = simulation.get_ticks()
         self.immunity_duration = duration
         self.immunity = True
         self.check_for_immunity = True
@@ -144,15 +134,15 @@ class Character(Combat, Physics, pg.sprite.Sprite):
         fire speed
         """
 
-        self.fast_time = pg.time.get_ticks()
+        self.fast_time = simulation.get_ticks()
         self.rapid_fire_duration = duration
         self.rapid_fire = True
         self.check_for_rapid_fire = True
         self.fire_rate -= 40
 
-    def update(self) -> None:
+    def steer(self) -> None:
         """
-        Overrides pg.sprite.Sprite update function and gets called in /game.py/Game class
+        Overrides Physics steer function, called every update before the Character moves
 
         Depending on the check flags we check for boosts duration.
         Key -> movement is also done here.
@@ -161,7 +151,7 @@ class Character(Combat, Physics, pg.sprite.Sprite):
         self.image = self.images[self.image_code]
 
         if self.check_for_double_shot:
-            now = pg.time.get_ticks()
+            now = simulation.get_ticks()
             if now > self.double_shot_time + self.double_shot_duration * 1000:
                 self.time_update = now
                 self.double_s = False
@@ -169,21 +159,21 @@ class Character(Combat, Physics, pg.sprite.Sprite):
                 self.check_for_double_shot = False
 
         if self.check_for_immunity:
-            now = pg.time.get_ticks()
+            now = simulation.get_ticks()
             if now > self.immune_time + self.immunity_duration * 1000:
                 self.time_update = now
                 self.immunity = False
                 self.check_for_immunity = False
 
         if self.check_for_rapid_fire:
-            now = pg.time.get_ticks()
+            now = simulation.get_ticks()
             if now > self.fast_time + self.rapid_fire_duration * 1000:
                 self.time_update = now
                 self.immunity = False
                 self.check_for_rapid_fire = False
                 self.fire_rate += 40
 
-        self.key = pg.key.get_pressed()
+        self.key = self.game.keys
 
         self.acc.y = self.acc.x = 0
         if self.key[pg.K_UP] or self.key[pg.K_w]:
@@ -196,5 +186,3 @@ class Character(Combat, Physics, pg.sprite.Sprite):
             self.acc.x = self.player_acc
         if self.key[pg.K_SPACE]:
             self._shot()
-
-        super().update()
@@ -1,8 +1,8 @@
 import logging
-import random
 
 import pygame as pg
 
+from project import simulation
 from project.sprites.game_elements import Item, Projectile
 
 logger = logging.getLogger('last_judgment_logger')
@@ -14,7 +14,7 @@ class Combat:
         * damage
         * shooting
         * drops
-        * Sprite disposal
+        * Sprite disposal, together with everything attached to it
     """
 
     def __init__(
@@ -48,6 +48,7 @@ class Combat:
         # 2 -> Small foe
 
         self.last_update = 0
+        self.attachments = []
 
     def damage(self, projectile: Projectile) -> None:
         """"
@@ -64,6 +65,22 @@ class Combat:
         if self.health <= 0:
             self._destroy()
 
+    def attach(self, child):
+        """
+        Makes :param child: (anything with a kill method, like a DynamicHealthbar) go whenever this Sprite is killed.
+        """
+        self.attachments.append(child)
+        return child
+
+    def kill(self) -> None:
+        """
+        Overrides pg.sprite.Sprite kill function, takes the attachments with it
+        """
+        super().kill()
+        for child in self.attachments:
+            child.kill()
+        self.attachments.clear()
+
     def _destroy(self) -> None:
         """
         Destroys the Sprite
@@ -80,8 +97,8 @@ class Combat:
         """
         Generates a power up
         """
-        if 0.1 + (self.game.wave_generator.difficulty - 1) * 0.05 > random.uniform(0, 1):
-            Item(self.game)
+        if 0.1 + (self.game.wave_generator.difficulty - 1) * 0.05 > simulation.rng.uniform(0, 1):
+            self.game.kind(Item)(self.game)
 
     def _shot(self, angle: float=0, spawn_point: pg.Vector2=None) -> None:
         """
@@ -91,15 +108,29 @@ class Combat:
         :param angle: float=0 Represents the angle in radians
         :param spawn_point: pg.Vector2= None
         """
-        now = pg.time.get_ticks()
+        now = simulation.get_ticks()
         if now - self.last_update > self.fire_rate:
             self.last_update = now
-            if self.double_s:
-                for i in range(0, 2):
-                    ypos = self.game.devchar.pos.y - 30 * i
-                    xpos = self.game.devchar.pos.x + 30
-                    self.projectiles.append(Projectile(self.game, self, angle=angle,
-                                            spawn_point=pg.Vector2(xpos, ypos), damage=self.attack))
-            else:
-                self.projectiles.append(
-                    Projectile(self.game, self, angle=angle, spawn_point=spawn_point, damage=self.attack))
+            self._volley(angle, spawn_point)
+
+    def _volley(self, angle: float, spawn_point) -> None:
+        """
+        The projectiles of one shot, two with the double shot.
+        """
+        if self.double_s:
+            for i in range(0, 2):
+                ypos = self.game.devchar.pos.y - 30 * i
+                xpos = self.game.devchar.pos.x + 30
+                self._fire(angle, pg.Vector2(xpos, ypos))
+        else:
+            self._fire(angle, spawn_point)
+
+    def _fire(self, angle: float, spawn_point) -> None:
+        """
+        Puts one projectile in the game, either as a pooled sprite or as a row of the array engine.
+        """
+        if self.game.projectile_engine is not None:
+            self.game.projectile_engine.fire(self, angle=angle, spawn_point=spawn_point, damage=self.attack)
+        else:
+            self.projectiles.add(
+                self.game.projectile_pool.fire(self, angle=angle, spawn_point=spawn_point, damage=self.attack))
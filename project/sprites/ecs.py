@@ -0,0 +1,518 @@
+import math
+
+import pygame as pg
+
+from project import simulation
+from project.constants import Color, HEIGHT, WIDTH
+from project.sprites.character import Character
+from project.sprites.fighter import Fighter
+from project.sprites.game_elements import Item, Projectile
+from project.sprites.mine import Mine
+from project.sprites.sprite_internals import integrate
+from project.sprites.structure import Structure
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the ECS needs it
+    np = None
+
+
+class VectorView:
+    """
+    Stands in for the pg.Vector2 of an Entity's vector component, reading and writing its row of the array.
+
+    Get it from the entity every time (entity.pos.x = ...), the row can belong to another entity once this one left
+    the World.
+    """
+    __slots__ = ('world', 'array', 'slot')
+
+    def __init__(self, world, array: str, slot: int):
+        self.world = world
+        self.array = array
+        self.slot = slot
+
+    def _row(self):
+        return getattr(self.world, self.array)[self.slot]
+
+    @property
+    def x(self) -> float:
+        return getattr(self.world, self.array)[self.slot, 0].item()
+
+    @x.setter
+    def x(self, value: float) -> None:
+        getattr(self.world, self.array)[self.slot, 0] = value
+
+    @property
+    def y(self) -> float:
+        return getattr(self.world, self.array)[self.slot, 1].item()
+
+    @y.setter
+    def y(self, value: float) -> None:
+        getattr(self.world, self.array)[self.slot, 1] = value
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index: int) -> float:
+        return self._row()[index].item()
+
+    def __iter__(self):
+        return iter(self._row().tolist())
+
+    def update(self, *args) -> None:
+        self._row()[:] = tuple(pg.Vector2(*args))
+
+    def __iadd__(self, other):
+        self._row()[:] += tuple(other)
+        return self
+
+    def __isub__(self, other):
+        self._row()[:] -= tuple(other)
+        return self
+
+    def __add__(self, other):
+        return pg.Vector2(self) + other
+
+    def __sub__(self, other):
+        return pg.Vector2(self) - other
+
+    def __mul__(self, other):
+        return pg.Vector2(self) * other
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        return pg.Vector2(self) == other
+
+    def __repr__(self):
+        return repr(pg.Vector2(self))
+
+    def __str__(self):
+        return str(pg.Vector2(self))
+
+
+class Component:
+    """
+    Attribute of an Entity that lives in the World's :param array: while the entity is in the World, and in the
+    instance like any other attribute while it isn't.
+    """
+
+    def __init__(self, array: str, cast=None):
+        """
+        :param cast: turns the array's value into the attribute's, e.g. bool for a flag kept as a number
+        """
+        self.array = array
+        self.cast = cast
+        self.name = None
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        if entity.slot is None:
+            try:
+                return entity.__dict__[self.name]
+            except KeyError:
+                raise AttributeError(self.name) from None
+        value = getattr(entity.world, self.array)[entity.slot].item()
+        return value if self.cast is None else self.cast(value)
+
+    def __set__(self, entity, value) -> None:
+        if entity.slot is None:
+            entity.__dict__[self.name] = value
+        else:
+            getattr(entity.world, self.array)[entity.slot] = value
+
+    def detach(self, world, slot: int):
+        """
+        The value to keep in the instance once the entity leaves the World.
+        """
+        value = getattr(world, self.array)[slot].item()
+        return value if self.cast is None else self.cast(value)
+
+
+class VectorComponent(Component):
+    """
+    A Component made of two floats, read as a VectorView.
+    """
+
+    def __get__(self, entity, owner=None):
+        if entity is None or entity.slot is None:
+            return super().__get__(entity, owner)
+        return VectorView(entity.world, self.array, entity.slot)
+
+    def detach(self, world, slot: int):
+        return pg.Vector2(getattr(world, self.array)[slot].tolist())
+
+
+class Entity:
+    """
+    Mixin that turns a sprite class into an ECS adapter: once the entity is built (or fired, for a Projectile) and in
+    game.all_sprites its components move into the World's arrays, until it's killed. The rest of its attributes and
+    all of its code stay as they are.
+
+    Adapters declare their components as class attributes, see PhysicsComponents and CombatComponents.
+    """
+    slot = None
+    world = None
+    components = {}
+    # Moves with the other Physics entities, steer() and settle() run around the movement system
+    moves = False
+    # Flies like a Projectile, fully handled by the systems
+    flies = False
+    # Updated before the others, which read where it is after it moved (the player)
+    leads = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.components = {name: value for klass in reversed(cls.__mro__)
+                          for name, value in vars(klass).items() if isinstance(value, Component)}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.game.all_sprites.has_internal(self):
+            self.game.world.join(self)
+
+    def kill(self) -> None:
+        super().kill()
+        self.game.world.leave(self)
+
+
+class PhysicsComponents:
+    pos = VectorComponent('pos')
+    vel = VectorComponent('vel')
+    acc = VectorComponent('acc')
+    friction = Component('friction')
+    max_speed = Component('max_speed')
+
+
+class CombatComponents:
+    health = Component('health')
+    max_health = Component('max_health')
+    shield = Component('shield')
+    armor = Component('armor')
+    fire_rate = Component('fire_rate')
+    last_update = Component('last_shot')
+    evil = Component('faction', bool)
+
+    def _shot(self, angle: float = 0, spawn_point: pg.Vector2 = None) -> None:
+        """
+        Overrides Combat _shot function, during the World's update the firing system takes the shot.
+        """
+        if self.world.updating:
+            self.world.trigger(self, angle, spawn_point)
+        else:
+            super()._shot(angle, spawn_point)
+
+    def damage(self, projectile) -> None:
+        """
+        Overrides Combat damage function, the damage system applies every hit of the frame at once.
+        """
+        if not self.immunity:
+            self.world.hit(self, projectile)
+
+
+class CharacterEntity(Entity, CombatComponents, PhysicsComponents, Character):
+    moves = True
+    leads = True
+
+
+class FighterEntity(Entity, CombatComponents, PhysicsComponents, Fighter):
+    moves = True
+
+
+class StructureEntity(Entity, CombatComponents, Structure):
+    pos = VectorComponent('pos')
+    vel = VectorComponent('vel')
+
+
+class MineEntity(Entity, CombatComponents, Mine):
+    pos = VectorComponent('pos')
+    vel = VectorComponent('vel')
+
+
+class ProjectileEntity(Entity, PhysicsComponents, Projectile):
+    moves = True
+    flies = True
+    direction = VectorComponent('direction')
+
+    def fire(self, owner, angle: float, damage: int = 2, penetration: int = 0, spawn_point=None) -> None:
+        super().fire(owner, angle, damage, penetration, spawn_point)
+        world = self.game.world
+        self.friction = world.flight_friction
+        # Same maths as Projectile.settle()
+        self.direction = (world.flight_speed * math.cos(angle), -world.flight_speed * math.sin(angle))
+        world.join(self)
+
+
+class ItemEntity(Entity, Item):
+    pass
+
+
+class World:
+    """
+    Entity-component store: the components of every entity (position, velocity, health, shield, armor, fire
+    cooldown, faction...) live in numpy arrays, one row per entity, and the systems run over all rows at once.
+
+    The sprites keep their classes through thin adapters (Game.kind() hands them out), so the rest of the game sees
+    no difference. A frame's update goes:
+        * the player first, the others read where it is after it moved
+        * steer() of everything that moves, update() of everything else, in all_sprites order
+        * the firing system: cooldowns of everything that pulled the trigger, then the shots in all_sprites order
+        * the movement system: Physics.move() of all of them at once, then their rects
+        * projectile flight and settle() of the rest
+    and the damage system applies the frame's hits at once. The maths is the same as the sprites', so the game
+    plays the same with or without it.
+    """
+    # name: (shape of a row, dtype, value of an empty row)
+    arrays = {
+        'pos': ((2,), 'float64', 0), 'vel': ((2,), 'float64', 0), 'acc': ((2,), 'float64', 0),
+        'friction': ((), 'float64', 1), 'max_speed': ((), 'float64', 0), 'direction': ((2,), 'float64', 0),
+        'health': ((), 'float64', 0), 'max_health': ((), 'float64', 0), 'shield': ((), 'float64', 0),
+        'armor': ((), 'int64', 0), 'fire_rate': ((), 'int64', 0), 'last_shot': ((), 'int64', 0),
+        'faction': ((), 'int8', 0), 'triggered': ((), 'bool', False), 'aim': ((), 'float64', 0),
+        'muzzle': ((2,), 'float64', math.nan), 'order': ((), 'int64', 0), 'alive': ((), 'bool', False),
+        'moves': ((), 'bool', False), 'flies': ((), 'bool', False), 'leads': ((), 'bool', False),
+    }
+    adapters = {Character: CharacterEntity, Fighter: FighterEntity, Structure: StructureEntity, Mine: MineEntity,
+                Projectile: ProjectileEntity, Item: ItemEntity}
+
+    def __init__(self, game, capacity: int = 256):
+        if np is None:
+            raise RuntimeError('The ECS needs numpy, install it with: pipenv install numpy')
+
+        self.game = game
+        self.count = 0
+        self.free = []
+        self.joined = 0
+        self.entities = [None] * capacity
+        for name, (shape, dtype, empty) in World.arrays.items():
+            setattr(self, name, np.full((capacity,) + shape, empty, dtype=dtype))
+
+        # Hits the damage system has yet to apply: targets, damage, penetration
+        self.hits = ([], [], [])
+        self.updating = False
+        self.first_new = 0
+
+        # Projectile flight, like in Projectile.steer() and settle()
+        self.flight_friction = 0.012
+        self.flight_speed = 10
+        self.top_speed = 20
+
+    def __len__(self):
+        return self.count - len(self.free)
+
+    @classmethod
+    def adapter(cls, kind: type) -> type:
+        return cls.adapters.get(kind, kind)
+
+    def _grow(self) -> None:
+        capacity = len(self.entities) * 2
+        self.entities += [None] * (capacity - len(self.entities))
+        for name, (shape, dtype, empty) in World.arrays.items():
+            old = getattr(self, name)
+            new = np.full((capacity,) + shape, empty, dtype=dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def join(self, entity: Entity) -> None:
+        """
+        Gives :param entity: a row and moves its components there.
+
+        Arrays the entity has no component for keep whatever the row's last entity left in them.
+        """
+        if entity.slot is not None:
+            return
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.count == len(self.entities):
+                self._grow()
+            slot = self.count
+            self.count += 1
+
+        self.entities[slot] = entity
+        self.alive[slot] = True
+        self.order[slot] = self.joined
+        self.joined += 1
+        self.moves[slot] = entity.moves
+        self.flies[slot] = entity.flies
+        self.leads[slot] = entity.leads
+
+        values = entity.__dict__
+        for name, component in entity.components.items():
+            array = component.array
+            getattr(self, array)[slot] = values.pop(name) if name in values else World.arrays[array][2]
+        entity.world = self
+        entity.slot = slot
+
+    def leave(self, entity: Entity) -> None:
+        """
+        Moves the components of :param entity: back into it and frees its row.
+        """
+        slot = entity.slot
+        if slot is None:
+            return
+        for name, component in entity.components.items():
+            entity.__dict__[name] = component.detach(self, slot)
+        entity.slot = None
+        self.entities[slot] = None
+        self.alive[slot] = False
+        self.triggered[slot] = False
+        self.free.append(slot)
+
+    def update(self) -> None:
+        """
+        Replaces all_sprites.update(), see the class docstring. Every sprite in all_sprites has to be an Entity.
+        """
+        rows = np.flatnonzero(self.alive[:self.count])
+        # In the order they joined, which is all_sprites' order
+        rows = rows[np.argsort(self.order[rows], kind='stable')]
+        leads = self.leads[rows]
+        # Joined during the update (shots), they first move next frame like in all_sprites.update()
+        self.first_new = self.joined
+        self.updating = True
+        try:
+            self._stage(rows[leads])
+            self._stage(rows[~leads])
+        finally:
+            self.updating = False
+
+    def _stage(self, rows: 'np.ndarray') -> None:
+        entities = self.entities
+        for slot in rows[~self.flies[rows]].tolist():
+            entity = entities[slot]
+            if entity is None:
+                continue
+            if entity.moves:
+                entity.steer()
+            else:
+                entity.update()
+
+        self._fire()
+
+        moving = rows[self.moves[rows]]
+        moving = moving[self.alive[moving] & (self.order[moving] < self.first_new)]
+        if not len(moving):
+            return
+        self._move(moving)
+        for slot, center in zip(moving.tolist(), self.pos[moving].tolist()):
+            entities[slot].rect.center = center
+
+        flying = self.flies[moving]
+        self._fly(moving[flying])
+        for slot in moving[~flying].tolist():
+            entities[slot].settle()
+
+    def trigger(self, entity: Entity, angle: float, spawn_point) -> None:
+        """
+        :param entity: wants to shoot this frame, the firing system decides whether its cooldown is over.
+        """
+        slot = entity.slot
+        self.triggered[slot] = True
+        self.aim[slot] = angle
+        self.muzzle[slot] = (math.nan, math.nan) if spawn_point is None else tuple(spawn_point)
+
+    def _fire(self) -> None:
+        """
+        Firing system: Combat._shot() for every entity that pulled the trigger.
+        """
+        rows = np.flatnonzero(self.triggered[:self.count])
+        if not len(rows):
+            return
+        self.triggered[rows] = False
+        now = simulation.get_ticks()
+        ready = rows[now - self.last_shot[rows] > self.fire_rate[rows]]
+        self.last_shot[ready] = now
+        for slot in ready[np.argsort(self.order[ready], kind='stable')].tolist():
+            muzzle = self.muzzle[slot].tolist()
+            self.entities[slot]._volley(self.aim[slot].item(), None if math.isnan(muzzle[0]) else tuple(muzzle))
+
+    def _move(self, slots: 'np.ndarray') -> None:
+        """
+        Movement system: Physics.move() for every row of :param slots: at once.
+        """
+        pos, vel, acc = self.pos[slots], self.vel[slots], self.acc[slots]
+        integrate(pos, vel, acc, self.friction[slots, None], self.max_speed[slots, None])
+        self.pos[slots], self.vel[slots], self.acc[slots] = pos, vel, acc
+
+    def _fly(self, slots: 'np.ndarray') -> None:
+        """
+        Projectile flight, Projectile.settle() for every row of :param slots:
+        """
+        if not len(slots):
+            return
+        self.vel[slots] = self.direction[slots]
+        self.max_speed[slots] = self.top_speed
+        x, y = self.pos[slots, 0], self.pos[slots, 1]
+        for slot in slots[(y > HEIGHT) | (y < 0) | (x > WIDTH) | (x < 0)].tolist():
+            self.entities[slot].destroy()
+
+    def hit(self, entity: Entity, projectile) -> None:
+        targets, damage, penetration = self.hits
+        targets.append(entity)
+        damage.append(projectile.damage)
+        penetration.append(projectile.penetration)
+
+    def apply_damage(self) -> None:
+        """
+        Damage system: Combat.damage() for every hit since the last call at once.
+
+        Hits on the same target count one after the other, like the scalar version: into the shield while it
+        lasts, then into the health. Every hit that leaves the target at no health destroys it.
+        """
+        targets, damage, penetration = self.hits
+        if not targets:
+            return
+        self.hits = ([], [], [])
+        entities = targets
+        targets = np.fromiter((entity.slot for entity in entities), dtype=np.intp, count=len(entities))
+        dealt = np.maximum(np.array(damage, dtype='float64')
+                           - np.maximum(self.armor[targets] - np.array(penetration), 0), 0)
+
+        # Hits grouped by target, in the order they happened
+        order = np.argsort(targets, kind='stable')
+        grouped, grouped_dealt = targets[order], dealt[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = grouped[1:] != grouped[:-1]
+
+        def before(values):
+            # Sum of the values of the target's earlier hits
+            total = np.cumsum(values) - values
+            return total - np.maximum.accumulate(np.where(first, total, 0))
+
+        to_shield = self.shield[grouped] - before(grouped_dealt) > 0
+        to_health = np.where(to_shield, 0, grouped_dealt)
+        lethal = np.empty(len(order), dtype=bool)
+        lethal[order] = self.health[grouped] - before(to_health) - to_health <= 0
+
+        np.subtract.at(self.shield, grouped, np.where(to_shield, grouped_dealt, 0))
+        np.subtract.at(self.health, grouped, to_health)
+
+        for i in np.flatnonzero(lethal).tolist():
+            entities[i]._destroy()
+
+    def refresh(self, bars: list) -> None:
+        """
+        Rendering system: DynamicHealthbar.refresh() for every bar at once.
+        """
+        owned = [bar for bar in bars if getattr(bar.owner, 'slot', None) is not None]
+        for bar in bars:
+            if getattr(bar.owner, 'slot', None) is None:
+                bar.refresh()
+        if not owned:
+            return
+        slots = np.fromiter((bar.owner.slot for bar in owned), dtype=np.intp, count=len(owned))
+        health = np.maximum(self.health[slots], 0)
+        self.health[slots] = health
+        max_health = self.max_health[slots]
+        widths = np.fromiter((bar.owner.rect.width for bar in owned), dtype='float64', count=len(owned))
+        widths = np.ceil(health / max_health * widths * 0.8).astype(np.int64)
+        green = health > max_health * 0.4
+        for bar, value, width, healthy in zip(owned, health.tolist(), widths.tolist(), green.tolist()):
+            if value != bar.health:
+                bar.health = value
+                bar.width = width
+                bar.color = Color.pure_green if healthy else Color.red
@@ -1,12 +1,13 @@
 import math
-from collections import deque
 from pathlib import PurePath
 from typing import Union
 
 import pygame as pg
 
 from project.constants import FIGHTER_IMAGE_NAME, PATH_IMAGES
+from project.resources import registry
 from project.sprites.combat import Combat
+from project.sprites.rotation import rotations
 from project.sprites.sprite_internals import Physics
 from project.ui.character_interface import DynamicHealthbar
 
@@ -15,6 +16,7 @@ class Fighter(Combat, Physics, pg.sprite.Sprite):
     """
     Represents a fighters that circle around the player and rapidly shoot weak projectiles at him
     """
+    path = str(PurePath(PATH_IMAGES).joinpath(FIGHTER_IMAGE_NAME))
 
     def __init__(
         self,
@@ -35,28 +37,37 @@ class Fighter(Combat, Physics, pg.sprite.Sprite):
         self.projectile_scale = 0.5
         self.add(self.game.all_sprites, self.game.enemy_sprites)
         self.attack = 1
-        self.image = pg.image.load(str(PurePath(PATH_IMAGES).joinpath(FIGHTER_IMAGE_NAME)))
+        self.image = Fighter.load_images()
 
         self.base_image = self.image
 
         self.rect = self.image.get_rect()
 
-        self.projectiles = deque()
+        self.projectiles = set()
         self.evil = True
-        self.healthbar = DynamicHealthbar(self.game, self)
+        self.healthbar = self.attach(DynamicHealthbar(self.game, self))
         self.mask = pg.mask.from_surface(self.image)
 
-    def update(self):
+    @staticmethod
+    def load_images() -> pg.Surface:
         """
-        Overrides pg.sprite.Sprite update function and gets called in /game.py/Game class
+        Gets the fighter's image from the asset registry, also used to preload it before a wave spawns.
+        """
+        return registry.image(Fighter.path)
+
+    def steer(self):
+        """
+        Overrides Physics steer function, called every update before the Fighter moves
 
         Turn towards the player and let the Physics do the rest
         """
         angle = math.atan2(self.pos.y - self.game.devchar.pos.y, - (self.pos.x - self.game.devchar.pos.x))
         # -90 extra because of how the image is aligned
-        self.image = pg.transform.rotate(self.base_image, angle * 180 / math.pi + -90)
+        rotation = rotations.rotate(Fighter.path, self.base_image, angle * 180 / math.pi + -90)
+        self.image = rotation.image
+        self.mask = rotation.mask
+        self.rect = rotation.rect_at(self.rect.center)
 
         self.acc.y = -math.sin(angle)
         self.acc.x = math.cos(angle)
         self._shot(angle, self.rect.midleft)
-        super().update()
@@ -1,22 +1,27 @@
 import logging
 import math
-import random
 from pathlib import PurePath
 
 import pygame as pg
 
-from project.constants import (Color, DEFAULT_FONT_NAME, HEIGHT, PATH_IMAGES, POWERUPS, POWERUP_EFFECT,
+from project import simulation
+from project.constants import (DEFAULT_FONT_NAME, HEIGHT, MAX_SPEED, PATH_IMAGES, POWERUP_EFFECT,
                                PROJECTILE_IMAGE_NAME, WIDTH)
-from project.sprites.sprite_internals import Physics
-from project.ui.sheet import Sheet
+from project.resources import registry
+from project.sprites.rotation import rotations
+from project.sprites.sprite_internals import CompactSprite, Physics
+from project.ui.atlas import atlas
 from project.ui.timer import Timer
 
 logger = logging.getLogger('last_judgment_logger')
 
 
-class Projectile(Physics, pg.sprite.Sprite):
+class Projectile(Physics, CompactSprite):
     """Basic Projectile Sprite
 
+    A CompactSprite, there can be thousands of them. The image and mask are the rotation cache's, shared by every
+    projectile of the same blaster and angle.
+
     Blaster 0 -> Green
     Blaster 1 -> Blue_marine
     Blaster 2 -> Yellow
@@ -25,19 +30,36 @@ class Projectile(Physics, pg.sprite.Sprite):
     Blaster 5 -> Purple  For double shots
     Blaster 6 -> Blue
     """
-    blasters = {'green': pg.image.load(str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[0]))),
-                'blue_marine': pg.image.load(str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[1]))),
-                'yellow': pg.image.load(str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[2]))),
-                'orange': pg.image.load(str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[3]))),
-                'red': pg.image.load(str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[4]))),
-                'purple': pg.image.load(str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[5]))),
-                'blue': pg.image.load(str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[6])))
+    blasters = {'green': str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[0])),
+                'blue_marine': str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[1])),
+                'yellow': str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[2])),
+                'orange': str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[3])),
+                'red': str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[4])),
+                'purple': str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[5])),
+                'blue': str(PurePath(PATH_IMAGES).joinpath(PROJECTILE_IMAGE_NAME[6]))
                 }
-
-    def __init__(self, game, owner, angle: float, damage: int=2, penetration: int=0, spawn_point=None):
+    # Blaster of every owner type
+    colors = {1: 'green', 5: 'purple', 4: 'red', 6: 'orange'}
+    # Shots keep flying after whoever fired them died, see LeakDetector
+    outlives_owner = True
+    __slots__ = Physics.fields + ('game', 'pool', 'pool_key', 'owner', 'angle', 'damage', 'penetration', 'image',
+                                  'mask', 'rect')
+
+    def __init__(self, game, owner=None, angle: float = 0, damage: int = 2, penetration: int = 0, spawn_point=None):
         super().__init__()
         self.game = game
+        self.pool = None
+        self.pool_key = None
+
+        if owner is not None:
+            self.fire(owner, angle, damage, penetration, spawn_point)
+
+    def fire(self, owner, angle: float, damage: int = 2, penetration: int = 0, spawn_point=None) -> None:
+        """
+        (Re)initializes the projectile and puts it in the game, so pooled projectiles can be fired again.
+        """
         self.owner = owner
+        self.pool_key = owner.type
         if owner.evil:
             self.add(self.game.all_sprites, self.game.enemy_projectiles)
         else:
@@ -47,45 +69,55 @@ class Projectile(Physics, pg.sprite.Sprite):
         self.damage = damage
         self.penetration = penetration
 
-        if self.owner.type == 1:
-            self.image = Projectile.blasters['green']
-        if self.owner.type == 5:
-            self.image = Projectile.blasters['purple']
-        if self.owner.type == 4:
-            self.image = Projectile.blasters['red']
-        if self.owner.type == 6:
-            self.image = Projectile.blasters['orange']
-
-        self.image = pg.transform.scale(self.image, (round(self.owner.projectile_scale*90),
-                                                     round(self.owner.projectile_scale*40)))
-        self.image = pg.transform.rotate(self.image, angle * 180 / math.pi)
+        self.acc.update(0, 0)
+        self.vel.update(0, 0)
+        self.max_speed = MAX_SPEED
+
+        color = Projectile.colors[self.owner.type]
+        scale = self.owner.projectile_scale
+        rotation = rotations.rotate((color, scale), Projectile.load_image(color, scale), angle * 180 / math.pi)
+        self.image = rotation.image
+        self.mask = rotation.mask
         if spawn_point is None:
-            self.pos = owner.rect.midright
+            self.pos = pg.Vector2(owner.rect.midright)
         else:
-            self.pos = spawn_point
+            self.pos = pg.Vector2(spawn_point)
 
-        self.rect = self.image.get_rect(center=self.pos)
-        self.mask = pg.mask.from_surface(self.image)
+        self.rect = rotation.rect_at(self.pos)
+
+    @staticmethod
+    def load_image(color: str, scale: float) -> pg.Surface:
+        """
+        Gets the unrotated blaster image from the asset registry, also used to preload it before a wave spawns.
+        """
+        return registry.image(Projectile.blasters[color], scale=(round(scale*90), round(scale*40)))
 
     def destroy(self):
-        # TODO FIX THIS BUG
+        """
+        Takes the projectile out of the game and gives it back to its pool, if it has one.
+
+        Safe to call more than once, e.g. when it hits two enemies in the same frame.
+        """
+        if not self.alive():
+            return
 
         self.kill()
-        try:
-            self.owner.projectiles.remove(self)
-        except ValueError:
-            pass
+        self.owner.projectiles.discard(self)
+        if self.pool is not None:
+            self.pool.release(self)
 
-    def update(self):
+    def steer(self):
         """
-        Overrides pg.sprite.Sprite update function and gets called in /game.py/Game class
-
-        Basic projectiles phisics, it supports multi directional projectiles
+        Overrides Physics steer function, called every update before the projectile moves
         """
-
         self.friction = 0.012
-        super().update()
 
+    def settle(self):
+        """
+        Overrides Physics settle function, called every update after the projectile moved
+
+        Basic projectiles phisics, it supports multi directional projectiles
+        """
         self.vel.y = -10 * math.sin(self.angle)
         self.vel.x = 10 * math.cos(self.angle)
 
@@ -101,7 +133,19 @@ class Projectile(Physics, pg.sprite.Sprite):
             self.destroy()
 
 
-class Item(pg.sprite.Sprite):
+class ItemKind:
+    """
+    What every drop of a color shares: the image and its mask.
+    """
+    __slots__ = ('color', 'image', 'mask')
+
+    def __init__(self, color: str):
+        self.color = color
+        self.image = Item.load_image(color)
+        self.mask = pg.mask.from_surface(self.image)
+
+
+class Item(CompactSprite):
     """Represents Items such as drops
 
     red: + soft hp
@@ -113,39 +157,45 @@ class Item(pg.sprite.Sprite):
     green: + armor
     w_green: permanent extra damage
     """
+    colors = ('red', 'pink', 'purple', 'blue', 'yellow', 'white', 'green', 'w_green')
+    # Color: ItemKind, built with the first drop of the color
+    kinds = {}
+    __slots__ = ('game', 'kind', 'rect')
+
     def __init__(self, game, color: str = None):
         super().__init__()
         self.game = game
-        self.color = color
         self.add(self.game.all_sprites, self.game.powerups)
 
-        self.color_location = {'red': (0, 0, 130, 130),
-                               'pink': (129, 0, 130, 130),
-                               'purple': (255, 0, 130, 130),
-                               'blue': (385, 0, 130, 130),
-                               'yellow': (0, 130, 130, 130),
-                               'white': (129, 130, 130, 130),
-                               'green': (255, 130, 130, 130),
-                               'w_green': (385, 130, 130, 130)
-                               }
-        if self.color is None:
-            self.type = random.choices(
-                ['red', 'pink', 'purple', 'blue', 'yellow', 'white', 'green', 'w_green'],
-                weights=[15, 5, 3, 7, 3, 3, 10, 10],
-                k=1
-            )[0]
-        else:
-            self.type = self.color
+        if color is None:
+            color = simulation.rng.choices(Item.colors, weights=[15, 5, 3, 7, 3, 3, 10, 10], k=1)[0]
 
-        self.image = Sheet(str(PurePath(PATH_IMAGES).joinpath(POWERUPS))).get_image(*self.color_location[self.type])
-        self.image.set_colorkey(Color.black)
-        self.image = pg.transform.scale(self.image, (35, 35))
+        self.kind = Item.kinds.get(color)
+        if self.kind is None:
+            self.kind = Item.kinds[color] = ItemKind(color)
         self.rect = self.image.get_rect()
-
-        self.mask = pg.mask.from_surface(self.image)
-        self.rect.center = (random.randint(200, 700), random.randint(200, 700))
+        self.rect.center = (simulation.rng.randint(200, 700), simulation.rng.randint(200, 700))
         logger.debug(f'Spawned a {self.type} powerup at {self.rect.center}')
 
+    @property
+    def type(self) -> str:
+        return self.kind.color
+
+    @property
+    def image(self) -> pg.Surface:
+        return self.kind.image
+
+    @property
+    def mask(self) -> pg.mask.Mask:
+        return self.kind.mask
+
+    @staticmethod
+    def load_image(color: str) -> pg.Surface:
+        """
+        Gets the powerup's image from the asset registry, also used to preload it before a wave spawns.
+        """
+        return atlas.image(f'item_{color}')
+
     def apply_powerup(self, character: pg.sprite.Sprite):
         """
         Calls Character functions that handle the powerup effects
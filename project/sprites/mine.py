@@ -1,18 +1,14 @@
-from pathlib import PurePath
-
 import pygame as pg
 
-from project.constants import Color, MINE_IMAGE_NAME, PATH_IMAGES
+from project import simulation
 from project.sprites.combat import Combat
-from project.ui.sheet import Sheet
+from project.ui.atlas import atlas
 
 
 class Mine(Combat, pg.sprite.Sprite):
     """
     Represents a Mine that slowly move to the asteroid, exploding on impact of asteroid or player.
     """
-    path = str(PurePath(PATH_IMAGES).joinpath(MINE_IMAGE_NAME))
-
     def __init__(
         self,
         game,
@@ -30,25 +26,29 @@ class Mine(Combat, pg.sprite.Sprite):
         self.attack = 3
         self.timer = 0
         self.current_frame = 0
-        self.frames = [pg.transform.scale(Sheet(Mine.path).get_image(0, 0, 250, 250, alpha=True), (100, 100)),
-                       pg.transform.scale(Sheet(Mine.path).get_image(250, 0, 250, 250, alpha=True), (100, 100))]
+        self.frames = Mine.load_images()
 
         self.image = self.frames[0]
         self.rect = self.image.get_rect()
 
         self.add(self.game.all_sprites, self.game.mines)
 
-        self.image.set_colorkey(Color.black)
-
         self.mask = pg.mask.from_surface(self.image)
 
+    @staticmethod
+    def load_images() -> list:
+        """
+        Gets the animation frames from the asset registry, also used to preload them before a wave spawns.
+        """
+        return [atlas.image('mine_0'), atlas.image('mine_1')]
+
     def update(self):
         """
         Overrides pg.sprite.Sprite update function and gets called in /game.py/Game class
 
         Move left untill off screen
         """
-        now = pg.time.get_ticks()
+        now = simulation.get_ticks()
         if now - self.timer > 500:
             self.timer = now
             self.current_frame = (self.current_frame + 1) % len(self.frames)
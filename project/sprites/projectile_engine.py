@@ -0,0 +1,208 @@
+import math
+
+import pygame as pg
+
+from project.constants import HEIGHT, MAX_SPEED, WIDTH
+from project.sprites.game_elements import Projectile
+from project.sprites.rotation import rotations
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only this engine needs it
+    np = None
+
+# Factions, they replace the others/enemy_projectiles groups of the sprite based projectiles
+PLAYER = 0  # others
+ENEMY = 1   # enemy_projectiles
+
+
+class ProjectileHit:
+    """
+    Stands in for a Projectile sprite when the engine reports a collision, see Combat.damage()
+    """
+    __slots__ = ('engine', 'index', 'damage', 'penetration')
+
+    def __init__(self, engine, index: int):
+        self.engine = engine
+        self.index = index
+        self.damage = int(engine.damage[index])
+        self.penetration = int(engine.penetration[index])
+
+    def destroy(self) -> None:
+        self.engine.alive[self.index] = False
+
+
+class ProjectileEngine:
+    """
+    Keeps every live projectile in contiguous numpy arrays, an alternative to the Projectile sprites.
+
+    Integration, culling, collision and drawing run over all projectiles at once instead of one update() call per
+    projectile. The maths is the same as Projectile.update(), so both engines play the same.
+    """
+
+    def __init__(self, game, capacity: int = 1024):
+        if np is None:
+            raise RuntimeError('The array projectile engine needs numpy, install it with: pipenv install numpy')
+
+        self.game = game
+        self.count = 0
+
+        self.pos = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))  # position before the last update, see snapshot()
+        self.vel = np.zeros((capacity, 2))
+        self.acc = np.zeros((capacity, 2))
+        self.direction = np.zeros((capacity, 2))  # velocity after the first frame: 10 * (cos, -sin) of the angle
+        self.max_speed = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.damage = np.zeros(capacity, dtype=np.int32)
+        self.penetration = np.zeros(capacity, dtype=np.int32)
+        self.faction = np.zeros(capacity, dtype=np.int8)
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Rotated images the projectiles are drawn with, indexed by self.frame
+        self.frames = []
+        self.frame_index = {}
+        self.offsets = np.zeros((0, 2), dtype=np.int64)
+        self.sizes = np.zeros((0, 2), dtype=np.int64)
+
+        self.friction = 0.012
+        self.speed = 10
+        self.top_speed = 20
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def _arrays(self) -> tuple:
+        return (self.pos, self.previous, self.vel, self.acc, self.direction, self.max_speed, self.angle, self.damage,
+                self.penetration, self.faction, self.frame, self.alive)
+
+    def _grow(self) -> None:
+        capacity = len(self.alive) * 2
+        for name in ('pos', 'previous', 'vel', 'acc', 'direction', 'max_speed', 'angle', 'damage', 'penetration',
+                     'faction', 'frame', 'alive'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _frame(self, color: str, scale: float, angle: float) -> int:
+        rotation = rotations.rotate((color, scale), Projectile.load_image(color, scale), angle * 180 / math.pi)
+        index = self.frame_index.get(id(rotation))
+        if index is None:
+            index = self.frame_index[id(rotation)] = len(self.frames)
+            self.frames.append(rotation)
+            self.offsets = np.vstack((self.offsets, rotation.offset))
+            self.sizes = np.vstack((self.sizes, rotation.image.get_size()))
+        return index
+
+    def fire(self, owner, angle: float, damage: int = 2, penetration: int = 0, spawn_point=None) -> None:
+        """
+        Same as ProjectilePool.fire(), but adds a row to the arrays instead of a sprite to the groups.
+        """
+        if self.count == len(self.alive):
+            self._grow()
+
+        i = self.count
+        self.count += 1
+
+        if spawn_point is None:
+            spawn_point = owner.rect.midright
+        self.pos[i] = self.previous[i] = spawn_point
+        self.vel[i] = 0
+        self.acc[i] = 0
+        self.direction[i] = (self.speed * math.cos(angle), -self.speed * math.sin(angle))
+        self.max_speed[i] = MAX_SPEED
+        self.angle[i] = angle
+        self.damage[i] = damage
+        self.penetration[i] = penetration
+        self.faction[i] = ENEMY if owner.evil else PLAYER
+        self.frame[i] = self._frame(Projectile.colors[owner.type], owner.projectile_scale, angle)
+        self.alive[i] = True
+
+    def _compact(self) -> None:
+        """
+        Moves the live projectiles to the front of the arrays.
+        """
+        n = self.count
+        keep = np.flatnonzero(self.alive[:n])
+        if len(keep) == n:
+            return
+        for array in self._arrays():
+            array[:len(keep)] = array[keep]
+        self.alive[len(keep):n] = False
+        self.count = len(keep)
+
+    def update(self) -> None:
+        """
+        One step of Projectile.update() for every projectile.
+        """
+        self._compact()
+        n = self.count
+        pos, vel, acc = self.pos[:n], self.vel[:n], self.acc[:n]
+        max_speed = self.max_speed[:n, None]
+
+        # Physics.update()
+        acc += vel * self.friction
+        vel += acc
+        np.clip(vel, -max_speed, max_speed, out=vel)
+        pos += vel + 0.5 * acc
+
+        vel[:] = self.direction[:n]
+        self.max_speed[:n] = self.top_speed
+
+        x, y = pos[:, 0], pos[:, 1]
+        self.alive[:n] &= (y <= HEIGHT) & (y >= 0) & (x <= WIDTH) & (x >= 0)
+
+    def snapshot(self) -> None:
+        """
+        Keeps the current positions, for draw() to interpolate from.
+        """
+        self.previous[:self.count] = self.pos[:self.count]
+
+    def _topleft(self, n: int, interpolation: float = 1) -> 'np.ndarray':
+        # Rounded half away from zero, like assigning the position to rect.center
+        pos = self.pos[:n]
+        if interpolation != 1:
+            previous = self.previous[:n]
+            pos = previous + (pos - previous) * interpolation
+        return np.trunc(pos + np.copysign(0.5, pos)).astype(np.int64) + self.offsets[self.frame[:n]]
+
+    def collide(self, sprite: pg.sprite.Sprite, faction: int) -> list:
+        """
+        Projectiles of :param faction: hitting :param sprite:, rect test for all of them at once and a mask test for
+        the ones whose rect overlaps.
+        """
+        n = self.count
+        if not n:
+            return []
+        topleft = self._topleft(n)
+        bottomright = topleft + self.sizes[self.frame[:n]]
+        rect = sprite.rect
+
+        candidates = np.flatnonzero(
+            self.alive[:n] & (self.faction[:n] == faction)
+            & (topleft[:, 0] < rect.right) & (bottomright[:, 0] > rect.left)
+            & (topleft[:, 1] < rect.bottom) & (bottomright[:, 1] > rect.top))
+
+        hits = []
+        for i in candidates.tolist():
+            offset = (int(topleft[i, 0]) - rect.left, int(topleft[i, 1]) - rect.top)
+            if sprite.mask.overlap(self.frames[self.frame[i]].mask, offset):
+                hits.append(ProjectileHit(self, i))
+        return hits
+
+    def draw(self, screen: pg.Surface, interpolation: float = 1) -> list:
+        """
+        Blits every live projectile in one call, returns the rects they cover.
+
+        :param interpolation: where to draw them between the last snapshot() (0) and now (1)
+        """
+        n = self.count
+        live = np.flatnonzero(self.alive[:n])
+        if not len(live):
+            return []
+        topleft = self._topleft(n, interpolation)[live].tolist()
+        frames = self.frames
+        return screen.blits([(frames[f].image, position)
+                             for f, position in zip(self.frame[live].tolist(), topleft)])
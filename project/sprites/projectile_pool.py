@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+from project.sprites.game_elements import Projectile
+
+
+class ProjectilePool:
+    """
+    Recycles Projectile sprites instead of building a new one for every shot.
+
+    Idle projectiles are kept in a free list per owner type. Firing takes one from the free list and resets it,
+    Projectile.destroy() hands it back. At most :param size: idle projectiles are kept per owner type.
+    """
+
+    def __init__(self, game, size: int):
+        self.game = game
+        self.size = size
+        self.free = defaultdict(list)
+
+        self.created = 0
+        self.reused = 0
+        self.exhausted = 0  # shots fired while the free list was empty, so a projectile had to be built
+        self.dropped = 0    # projectiles left to the garbage collector because their free list was full
+
+    def preallocate(self, owner_type: int, count: int) -> None:
+        """
+        Builds :param count: idle projectiles for owners of :param owner_type: ahead of time.
+        """
+        free = self.free[owner_type]
+        for _ in range(min(count, self.size - len(free))):
+            free.append(self._create())
+
+    def _create(self) -> Projectile:
+        self.created += 1
+        projectile = self.game.kind(Projectile)(self.game)
+        projectile.pool = self
+        return projectile
+
+    def fire(self, owner, angle: float, damage: int = 2, penetration: int = 0, spawn_point=None) -> Projectile:
+        """
+        Takes an idle projectile (or builds one if there is none left) and fires it, see Projectile.fire()
+        """
+        free = self.free[owner.type]
+        if free:
+            self.reused += 1
+            projectile = free.pop()
+        else:
+            self.exhausted += 1
+            projectile = self._create()
+
+        projectile.fire(owner, angle, damage, penetration, spawn_point)
+        return projectile
+
+    def release(self, projectile: Projectile) -> None:
+        """
+        Takes back a projectile that left the game. It lets go of its owner, an idle projectile mustn't keep a dead
+        Fighter or Structure around until it's fired again.
+        """
+        projectile.owner = None
+        free = self.free[projectile.pool_key]
+        if len(free) < self.size:
+            free.append(projectile)
+        else:
+            self.dropped += 1
+
+    def stats(self) -> dict:
+        """
+        What the pool did so far, reported by the benchmarks.
+        """
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'exhausted': self.exhausted,
+            'dropped': self.dropped,
+            'idle': sum(len(free) for free in self.free.values())
+        }
@@ -0,0 +1,66 @@
+import pygame as pg
+
+from project.constants import ROTATION_STEP
+
+
+class Rotation:
+    """
+    A pre-rotated image with its collision mask.
+
+    offset is the image's topleft relative to the center it rotates around.
+    """
+    __slots__ = ('image', 'mask', 'offset')
+
+    def __init__(self, image: pg.Surface):
+        self.image = image
+        self.mask = pg.mask.from_surface(image)
+        self.offset = (-(image.get_width() // 2), -(image.get_height() // 2))
+
+    def rect_at(self, center) -> pg.Rect:
+        """
+        Rect of the rotated image centered on :param center:
+        """
+        return self.image.get_rect(center=center)
+
+
+class RotationCache:
+    """
+    Hands out rotated images shared by every sprite, instead of rotating (and building a mask) every frame.
+
+    Angles are rounded to :param step: degrees, so there are at most 360 / step rotations per image.
+    """
+
+    def __init__(self, step: float):
+        self.step = step
+        self.buckets = round(360 / step)
+        self.rotations = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.rotations)
+
+    def rotate(self, key, image: pg.Surface, angle: float) -> Rotation:
+        """
+        :param key: anything hashable that identifies :param image:, e.g. its path
+        :param image: the unrotated image
+        :param angle: counterclockwise, in degrees, like pg.transform.rotate
+        """
+        bucket = round(angle / self.step) % self.buckets
+
+        rotation = self.rotations.get((key, bucket))
+        if rotation is not None:
+            self.hits += 1
+            return rotation
+
+        self.misses += 1
+        rotation = Rotation(pg.transform.rotate(image, bucket * self.step))
+        self.rotations[(key, bucket)] = rotation
+        return rotation
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.rotations)}
+
+
+rotations = RotationCache(ROTATION_STEP)
@@ -0,0 +1,73 @@
+from collections import defaultdict
+
+import pygame as pg
+
+
+class SpatialHash:
+    """
+    Uniform grid over a sprite group, so a collision check only looks at sprites in the cells the target covers
+    instead of the whole group.
+
+    Rebuild it once per frame, after the sprites moved. pairs_tested counts the rect tests done since the last
+    rebuild, total_pairs_tested all of them, the profiler overlay and the benchmarks show them (Game.pairs_tested()).
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.group = None
+
+        self.pairs_tested = 0
+        self.total_pairs_tested = 0
+
+    def __len__(self):
+        return len(self.group) if self.group is not None else 0
+
+    def _cells(self, rect: pg.Rect):
+        size = self.cell_size
+        for x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield x, y
+
+    def rebuild(self, group: pg.sprite.Group) -> None:
+        self.group = group
+        self.cells.clear()
+        self.pairs_tested = 0
+        for sprite in group:
+            for cell in self._cells(sprite.rect):
+                self.cells[cell].append(sprite)
+
+    def candidates(self, rect: pg.Rect) -> list:
+        """
+        Sprites of the group that share a cell with :param rect:, each one once.
+        """
+        found = {}
+        cells = self.cells
+        for cell in self._cells(rect):
+            for sprite in cells.get(cell, ()):
+                found[sprite] = None
+        return list(found)
+
+    def spritecollide(self, sprite: pg.sprite.Sprite, dokill: bool = False, collided=None) -> list:
+        """
+        Same as pg.sprite.spritecollide(sprite, group, dokill, collided), only checking nearby sprites.
+
+        Sprites removed from the group since the last rebuild are skipped.
+        """
+        rect = sprite.rect
+        group = self.group
+        hits = []
+
+        candidates = self.candidates(rect)
+        self.pairs_tested += len(candidates)
+        self.total_pairs_tested += len(candidates)
+
+        for candidate in candidates:
+            if not group.has_internal(candidate) or not rect.colliderect(candidate.rect):
+                continue
+            if collided is not None and not collided(sprite, candidate):
+                continue
+            if dokill:
+                candidate.kill()
+            hits.append(candidate)
+        return hits
@@ -1,10 +1,10 @@
 import math
-from collections import deque
 from pathlib import PurePath
 
 import pygame as pg
 
 from project.constants import Color, PATH_IMAGES, STRUCTURE_IMAGE_NAME
+from project.resources import registry
 from project.sprites.combat import Combat
 from project.ui.character_interface import DynamicHealthbar
 
@@ -15,6 +15,7 @@ class Structure(Combat, pg.sprite.Sprite):
 
     It slow move from off screen to their fixed position and then start firing at the player.
     """
+    path = str(PurePath(PATH_IMAGES).joinpath(STRUCTURE_IMAGE_NAME))
 
     def __init__(
         self,
@@ -33,19 +34,24 @@ class Structure(Combat, pg.sprite.Sprite):
         self.vel = vel
         self.pos = pos
         self.type = 6
-        self.image = pg.image.load(str(PurePath(PATH_IMAGES).joinpath(STRUCTURE_IMAGE_NAME)))
+        self.image = Structure.load_images()
         self.rect = self.image.get_rect()
         self.attack = 1
         self.add(self.game.all_sprites, self.game.enemy_sprites)
-
-        self.image.set_colorkey(Color.black)
-        self.projectiles = deque()
+        self.projectiles = set()
         self.evil = True
-        self.healthbar = DynamicHealthbar(self.game, self)
+        self.healthbar = self.attach(DynamicHealthbar(self.game, self))
         self.mask = pg.mask.from_surface(self.image)
 
         self.rect = self.image.get_rect(center=self.pos)
 
+    @staticmethod
+    def load_images() -> pg.Surface:
+        """
+        Gets the structure's image from the asset registry, also used to preload it before a wave spawns.
+        """
+        return registry.image(Structure.path, colorkey=Color.black)
+
     def update(self) -> None:
         """
         Overrides pg.sprite.Sprite update function and gets called in /game.py/Game class
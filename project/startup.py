@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupTrace:
+    """
+    Records where the time goes from starting the game until its first frame is on the screen.
+
+    Everything timed with phase() shows up in the report, nested phases indented under the one they ran in. Asset
+    loads are named 'image ...', 'sound ...' or 'font ...'. The clock starts when this module is imported, so import
+    it before anything else.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events = []
+        self.depth = 0
+        self.first_frame = None
+
+    @property
+    def done(self) -> bool:
+        return self.first_frame is not None
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        index = len(self.events)
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if not self.done:
+                self.events.insert(index, (name, self.depth, started - self.start, time.perf_counter() - started))
+
+    def finish(self) -> None:
+        """
+        Called once the first frame is drawn, nothing gets recorded after that.
+        """
+        if not self.done:
+            self.first_frame = time.perf_counter() - self.start
+
+    def report(self) -> str:
+        lines = [f'{"start ms":>9} {"took ms":>9}  what']
+        for name, depth, start, duration in self.events:
+            lines.append(f'{start * 1000:9.1f} {duration * 1000:9.1f}  {"  " * depth}{name}')
+
+        # Loads nested in another load (a scaled image loading the original) are part of that one
+        loads = []
+        outer = None
+        for name, depth, _start, duration in self.events:
+            if outer is not None and depth > outer:
+                continue
+            outer = None
+            if name.split(' ', 1)[0] in ('image', 'sound', 'font'):
+                loads.append(duration)
+                outer = depth
+        lines.append(f'{len(loads)} assets loaded in {sum(loads) * 1000:.1f} ms')
+        if self.done:
+            lines.append(f'first frame after {self.first_frame * 1000:.1f} ms')
+        return '\n'.join(lines)
+
+
+trace = StartupTrace()
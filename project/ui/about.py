@@ -2,11 +2,12 @@ import webbrowser as wb
 from pathlib import PurePath
 
 import pygame as pg
-from pygame.image import load
 
 from project.constants import BACKGROUND_2, BACK_BUTTON, CURSOR, CURSOR_HOVER, FPS, HOVER_SOUND, LABEL,\
-    MISTY_HATS_LOGO, MISTY_HATS_LOGO_HOVER, MISTY_LINK, PATH_BACKGROUNDS, PATH_BUTTONS, PATH_CURSORS, PATH_IMAGES,\
-    PYTHON_DISCORD_LINK, PYTHON_LOGO, PYTHON_LOGO_HOVER
+    MISTY_HATS_LOGO, MISTY_HATS_LOGO_HOVER, MISTY_LINK, PATH_BACKGROUNDS, PATH_BUTTONS, PATH_CURSORS, PATH_FX,\
+    PATH_IMAGES, PYTHON_DISCORD_LINK, PYTHON_LOGO, PYTHON_LOGO_HOVER
+from project.resources import registry
+from project.ui.compositor import LayerCompositor
 from project.ui.volume import get_volume
 
 # IF YOU ARE A MUGGLE DON'T LOOK AT THE CODE BECAUSE THERE ARE A LOT OF MAGIC NUMBERS
@@ -24,31 +25,34 @@ class About:
         Constructor for the about page.
         """
         self.screen = screen
-        self.background = load(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND_2)))
+        self.background = registry.image(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND_2)))
         self.sound = None
 
-        self.back_btn = load(str(PurePath(PATH_BUTTONS).joinpath(BACK_BUTTON)))
+        self.back_btn = registry.image(str(PurePath(PATH_BUTTONS).joinpath(BACK_BUTTON)))
         self.back_btn_rect = pg.Rect(20, 20, self.back_btn.get_width(), self.back_btn.get_height())
         self.back_btn_hover = False
         self.x = self.y = 0
 
         self.shift = 40
-        self.cursor = load(str(PurePath(PATH_CURSORS).joinpath(CURSOR))).convert_alpha()
-        self.cursor2 = load(str(PurePath(PATH_CURSORS).joinpath(CURSOR_HOVER))).convert_alpha()
+        self.cursor = registry.image(str(PurePath(PATH_CURSORS).joinpath(CURSOR)), alpha=True)
+        self.cursor2 = registry.image(str(PurePath(PATH_CURSORS).joinpath(CURSOR_HOVER)), alpha=True)
 
-        self.label = load(str(PurePath(PATH_IMAGES).joinpath(LABEL))).convert_alpha()
+        self.label = registry.image(str(PurePath(PATH_IMAGES).joinpath(LABEL)), alpha=True)
 
-        self.python_logo = load(str(PurePath(PATH_IMAGES).joinpath(PYTHON_LOGO))).convert_alpha()
-        self.python_logo_hover = load(str(PurePath(PATH_IMAGES).joinpath(PYTHON_LOGO_HOVER))).convert_alpha()
+        self.python_logo = registry.image(str(PurePath(PATH_IMAGES).joinpath(PYTHON_LOGO)), alpha=True)
+        self.python_logo_hover = registry.image(str(PurePath(PATH_IMAGES).joinpath(PYTHON_LOGO_HOVER)), alpha=True)
         self.python_logo_hovered = False
 
-        self.misty_logo = load(str(PurePath(PATH_IMAGES).joinpath(MISTY_HATS_LOGO))).convert_alpha()
-        self.misty_logo_hover = load(str(PurePath(PATH_IMAGES).joinpath(MISTY_HATS_LOGO_HOVER))).convert_alpha()
+        self.misty_logo = registry.image(str(PurePath(PATH_IMAGES).joinpath(MISTY_HATS_LOGO)), alpha=True)
+        self.misty_logo_hover = registry.image(str(PurePath(PATH_IMAGES).joinpath(MISTY_HATS_LOGO_HOVER)), alpha=True)
         self.misty_logo_hovered = False
 
-        self.text_img = load(str(PurePath(PATH_IMAGES).joinpath('text-about1.png'))).convert_alpha()
+        self.text_img = registry.image(str(PurePath(PATH_IMAGES).joinpath('text-about1.png')), alpha=True)
 
-        self.sound = HOVER_SOUND
+        self.layers = LayerCompositor(
+            self.screen, 'about', ((self.background, (0, 0)), (self.label, (0, 0)), (self.text_img, (0, 100))))
+
+        self.sound = registry.sound(str(PurePath(PATH_FX).joinpath(HOVER_SOUND)))
         self.sound.set_volume(get_volume())
 
     def handle_input(self)->None:
@@ -74,7 +78,7 @@ class About:
                     wb.open(PYTHON_DISCORD_LINK)
                 if event.type == pg.MOUSEBUTTONUP and self.misty_logo_hovered:
                     wb.open(MISTY_LINK)
-            pg.display.update()
+            self.layers.present()
         return running
 
     def draw(self):
@@ -92,11 +96,9 @@ class About:
 
     def _draw_background(self):
         """
-        Bliting the background image and the on the screen.
+        Bliting the background image, the label and the text on the screen (baked into one layer).
         """
-        self.screen.blit(self.background, (0, 0))
-        self.screen.blit(self.label, (0, 0))
-        self.screen.blit(self.text_img, (0, 100))
+        self.layers.begin()
 
     def _draw_cursor(self):
         """
@@ -104,9 +106,9 @@ class About:
         Classical cursor and finger cursor (if any hoverable element is hovered).
         """
         if any((self.back_btn_hover, self.python_logo_hovered, self.misty_logo_hovered)):
-            self.screen.blit(self.cursor2, (self.x, self.y))
+            self.layers.blit(self.cursor2, (self.x, self.y))
         else:
-            self.screen.blit(self.cursor, (self.x, self.y))
+            self.layers.blit(self.cursor, (self.x, self.y))
 
     def _draw_back_button(self)->None:
         """
@@ -120,7 +122,7 @@ class About:
             self.back_btn_rect.left = self.shift
         else:
             self.back_btn_rect.left = 20
-        self.screen.blit(self.back_btn, self.back_btn_rect)
+        self.layers.blit(self.back_btn, self.back_btn_rect)
 
     def _draw_python_logo(self)->None:
         """
@@ -129,10 +131,10 @@ class About:
         """
         if self._hovered(self.x, self.y, pg.Rect(940, 600, 940 + 318, 600 + 111)):
             self.python_logo_hovered = True
-            self.screen.blit(self.python_logo_hover, (940, 600))
+            self.layers.blit(self.python_logo_hover, (940, 600))
         else:
             self.python_logo_hovered = False
-            self.screen.blit(self.python_logo, (940, 600))
+            self.layers.blit(self.python_logo, (940, 600))
 
     def _draw_misty_logo(self)->None:
         """
@@ -141,10 +143,10 @@ class About:
         """
         if self._hovered(self.x, self.y, pg.Rect(800, 600, 120, 120)):
             self.misty_logo_hovered = True
-            self.screen.blit(self.misty_logo_hover, (800, 600))
+            self.layers.blit(self.misty_logo_hover, (800, 600))
         else:
             self.misty_logo_hovered = False
-            self.screen.blit(self.misty_logo, (800, 600))
+            self.layers.blit(self.misty_logo, (800, 600))
 
     def _play_sound(self)->None:
         """
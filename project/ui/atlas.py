@@ -0,0 +1,43 @@
+import json
+from pathlib import PurePath
+
+import pygame as pg
+
+from project.constants import PATH_ATLAS
+from project.resources import registry
+
+
+class Atlas:
+    """
+    Sprites cut out of the sheets and scaled ahead of time, packed into one image by python -m project.bake_atlas.
+
+    The index (name -> region in the atlas) is read on first use, the atlas image is loaded once through the asset
+    registry. The source sheets are never touched at runtime.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._index = None
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            with open(str(PurePath(self.path).joinpath('index.json'))) as f:
+                self._index = json.load(f)
+        return self._index
+
+    @property
+    def file(self) -> str:
+        """
+        Path of the atlas image.
+        """
+        return str(PurePath(self.path).joinpath(self.index['image']))
+
+    def image(self, name: str) -> pg.Surface:
+        """
+        The sprite called :param name: in the manifest, black is transparent in it like in Sheet.get_image.
+        """
+        return registry.image(self.file, tuple(self.index['regions'][name]))
+
+
+atlas = Atlas(PATH_ATLAS)
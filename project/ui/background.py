@@ -1,8 +1,9 @@
 from pathlib import PurePath
 
-from pygame.image import load
+import pygame as pg
 
 from project.constants import PATH_IMAGES
+from project.resources import registry
 
 
 class Background:
@@ -17,20 +18,45 @@ class Background:
         self.game = game
         self.screen = game.screen
         self.game.nonsprite.add(self)
-        self.image = load(str(PurePath(PATH_IMAGES).joinpath(image_name))).convert_alpha()
+        self.image = Background.load_image(image_name)
         self.x = 0
         self.x1 = self.bg_width = self.image.get_width()
         self.speed = speed
 
-    def draw(self):
+    @staticmethod
+    def path(image_name: str) -> str:
+        return str(PurePath(PATH_IMAGES).joinpath(image_name))
+
+    @staticmethod
+    def load_image(image_name: str) -> pg.Surface:
+        """
+        Gets the background image from the asset registry, also used to preload it.
         """
-        Bliting the background on the screen.
+        return registry.image(Background.path(image_name), alpha=True)
+
+    def update(self):
+        """
+        Scrolls the background by one simulation tick.
         """
         self.x -= self.speed
-        self.screen.blit(self.image, (self.x, 0))
         self.x1 -= self.speed
-        self.screen.blit(self.image, (self.x1, 0))
 
         if abs(self.x) >= self.bg_width:
             self.x += self.bg_width
             self.x1 += self.bg_width
+
+    def draw(self):
+        """
+        Bliting the background on the screen, where it is between the last two ticks.
+        """
+        x = self.x + round(self.speed * (1 - self.game.interpolation))
+        if x > 0:
+            x -= self.bg_width
+        self.screen.blit(self.image, (x, 0))
+        self.screen.blit(self.image, (x + self.bg_width, 0))
+
+    def dirty_rects(self) -> list:
+        """
+        A scrolling background changes the whole screen, a still one nothing.
+        """
+        return [self.screen.get_rect()] if self.speed else []
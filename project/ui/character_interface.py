@@ -5,12 +5,14 @@ import pygame as pg
 from pygame.math import Vector2 as Vec
 
 from project.constants import Color, HEALTHBAR, PATH_IMAGES, SHIELDBAR
+from project.resources import registry
 
 
 class StaticHealthbar:
     """
     Represents the static healthbar, art and functionality.
     """
+    paths = (str(PurePath(PATH_IMAGES).joinpath(HEALTHBAR)), str(PurePath(PATH_IMAGES).joinpath(SHIELDBAR)))
 
     def __init__(self, game, owner, x: int, y: int, width=None):
         super().__init__()
@@ -23,18 +25,22 @@ class StaticHealthbar:
         self.y = y
         self.width = width
 
-        self.image_hp = pg.image.load(str(PurePath(PATH_IMAGES).joinpath(HEALTHBAR))).convert_alpha()
-        self.image_hp = pg.transform.scale(self.image_hp, (250, 100))
-        self.image_hp.set_colorkey(Color.black)
+        self.image_hp, self.image_sp = StaticHealthbar.load_images()
         self.rect_hp = self.image_hp.get_rect()
         self.rect_hp.center = Vec(200, 40)
 
-        self.image_sp = pg.image.load(str(PurePath(PATH_IMAGES).joinpath(SHIELDBAR))).convert_alpha()
-        self.image_sp = pg.transform.scale(self.image_sp, (250, 100))
-        self.image_sp.set_colorkey(Color.black)
         self.rect_sp = self.image_sp.get_rect()
         self.rect_sp.center = Vec(410, 40)
 
+        self.drawn = []
+
+    @staticmethod
+    def load_images() -> tuple:
+        """
+        Gets the (health, shield) bar images from the asset registry, also used to preload them.
+        """
+        return tuple(registry.image(path, scale=(250, 100), colorkey=Color.black) for path in StaticHealthbar.paths)
+
     def draw(self)-> None:
 
         self.hp = self.owner.health
@@ -53,50 +59,106 @@ class StaticHealthbar:
         if self.sp == 0:
             sp_color = Color.black
 
-        pg.draw.rect(self.screen, hp_color, [100, 20, self.hp*1.75, 30])
+        self.drawn = [pg.draw.rect(self.screen, hp_color, [100, 20, self.hp*1.75, 30])]
 
         if self.sp is not None:
-            pg.draw.rect(self.screen, sp_color, [310, 20, self.sp*2.2, 30])
-        self.screen.blit(self.image_hp, self.rect_hp)
-        self.screen.blit(self.image_sp, self.rect_sp)
+            self.drawn.append(pg.draw.rect(self.screen, sp_color, [310, 20, self.sp*2.2, 30]))
+        self.drawn.append(self.screen.blit(self.image_hp, self.rect_hp))
+        self.drawn.append(self.screen.blit(self.image_sp, self.rect_sp))
+
+    def dirty_rects(self) -> list:
+        return self.drawn
 
 
-class DynamicHealthbar(pg.sprite.Sprite):
+class DynamicHealthbar:
     """
-    Represent a Healthbar that can be moved.
+    Represent a Healthbar that follows its owner around.
 
-    It's a sprite unlike static Healthbar because only Sprite objects can be moved, as its main
-    functionality and nature  has nothing to do with Sprites, it's on ui/ rather sprites/ folder.
+    It isn't drawn on its own, every DynamicHealthbar of the game is drawn by its HealthbarRenderer in one pass.
+    Attach it to its owner (Combat.attach) so it goes when the owner dies.
     """
+    height_scale = {0: 5, 1: 10, 2: 5, 4: 5, 6: 5}
+    __slots__ = ('owner', 'renderer', 'rect', 'health', 'width', 'color', '__weakref__')
 
     def __init__(self, game, owner):
-        super().__init__()
-        self.game = game
-        self.add(self.game.all_sprites)
         self.owner = owner
-        self.screen = self.game.screen
-        self.image = pg.Surface((100, 20))
-
-        self.height_scale = {0: 5, 1: 10, 2: 5, 4: 5, 6: 5}
-
-        self.rect = self.image.get_rect()
-
-        self.pos = Vec(self.owner.pos.x, self.owner.pos.y)
-
-    def update(self)-> None:
-        if self.owner.health != 20:
-            if self.owner.health < 0:
-                self.owner.health = 0
-            self.image = pg.Surface(
-                (math.ceil(self.owner.health/self.owner.max_health*self.owner.rect.width * 0.8),
-                 self.height_scale[self.owner.type]))
-            if self.owner.health > self.owner.max_health * 0.4:
-                self.image.fill(Color.pure_green)
-            else:
-                self.image.fill(Color.red)
+        self.renderer = game.healthbars
+        self.rect = pg.Rect(0, 0, 100, 20)
+        self.health = None
+        self.width = 0
+        self.color = Color.pure_green
+        self.renderer.add(self)
+
+    def kill(self) -> None:
+        self.renderer.remove(self)
+
+    def refresh(self) -> None:
+        """
+        Works out the bar's width and color again, if the owner's health changed.
+        """
+        if self.owner.health < 0:
+            self.owner.health = 0
+        if self.owner.health == self.health:
+            return
+        self.health = self.owner.health
+        self.width = math.ceil(self.health / self.owner.max_health * self.owner.rect.width * 0.8)
+        self.color = Color.pure_green if self.health > self.owner.max_health * 0.4 else Color.red
+
+    def place(self) -> pg.Rect:
+        """
+        Where the bar goes, under the owner's current rect.
+        """
+        self.rect.midtop = self.owner.rect.midbottom + Vec(self.owner.rect.width * 0.1, 5)
+        return self.rect
+
+
+class HealthbarRenderer:
+    """
+    Draws every DynamicHealthbar in one blits() call.
 
-            self.pos.x = self.owner.pos.x + 30
-            self.pos.y = self.owner.pos.y + 32
-            self.rect.midtop = self.owner.rect.midbottom + Vec(self.owner.rect.width * 0.1, 5)
+    Bars are cut out of strips that are filled once per height and color, so drawing them never allocates a
+    surface. With a :param world: (see sprites/ecs.py) the bars are refreshed by its rendering system.
+    """
 
-            self.game.screen.blit(self.image, self.rect)
+    def __init__(self, screen: pg.Surface, world=None):
+        self.screen = screen
+        self.world = world
+        self.bars = []
+        self.strips = {}
+
+    def __len__(self):
+        return len(self.bars)
+
+    def __iter__(self):
+        return iter(self.bars)
+
+    def add(self, bar: DynamicHealthbar) -> None:
+        self.bars.append(bar)
+
+    def remove(self, bar: DynamicHealthbar) -> None:
+        if bar in self.bars:
+            self.bars.remove(bar)
+
+    def strip(self, width: int, height: int, color: tuple) -> pg.Surface:
+        strip = self.strips.get((height, color))
+        if strip is None or strip.get_width() < width:
+            # Wide enough for every bar so far, the widest owner is only seen once
+            strip = self.strips[(height, color)] = pg.Surface((max(width, strip.get_width() if strip else 0), height))
+            strip.fill(color)
+        return strip
+
+    def draw(self) -> list:
+        """
+        Draws the bars under their owners' rects as they are now, returns the rects they cover.
+        """
+        if self.world is not None:
+            self.world.refresh(self.bars)
+        else:
+            for bar in self.bars:
+                bar.refresh()
+        blits = []
+        for bar in self.bars:
+            if bar.width > 0:
+                height = bar.height_scale[bar.owner.type]
+                blits.append((self.strip(bar.width, height, bar.color), bar.place(), (0, 0, bar.width, height)))
+        return self.screen.blits(blits)
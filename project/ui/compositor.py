@@ -0,0 +1,64 @@
+import pygame as pg
+
+
+class LayerCompositor:
+    """
+    Draws a menu screen as one baked background plus the interactive widgets on top of it.
+
+    The static layers (background, logos, labels) are blitted once into a display format surface, shared by every
+    page with the same :param key:. Each frame only the parts the widgets covered last frame are painted back from it,
+    and only those and the newly drawn widgets are pushed to the display.
+    """
+    baked = {}
+
+    def __init__(self, screen: pg.Surface, key: str, layers):
+        """
+        :param layers: (surface, position) pairs, bottom first
+        """
+        self.screen = screen
+        self.background = self.bake(key, screen.get_size(), layers)
+        self.drawn = None
+        self.restored = None
+
+    @classmethod
+    def bake(cls, key: str, size: tuple, layers) -> pg.Surface:
+        background = cls.baked.get(key)
+        if background is None:
+            background = pg.Surface(size).convert()
+            background.blits(list(layers), doreturn=False)
+            cls.baked[key] = background
+        return background
+
+    def invalidate(self) -> None:
+        """
+        The next frame gets drawn and pushed whole, e.g. after another page was drawn on the screen.
+        """
+        self.drawn = None
+
+    def begin(self) -> None:
+        """
+        Paints the background back over whatever the widgets covered last frame.
+        """
+        if self.drawn is None:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            self.screen.blits([(self.background, rect, rect) for rect in self.drawn], doreturn=False)
+        self.restored = self.drawn
+        self.drawn = []
+
+    def blit(self, surface: pg.Surface, position) -> pg.Rect:
+        """
+        Same as screen.blit(), for a widget drawn over the background this frame.
+        """
+        rect = self.screen.blit(surface, position)
+        self.drawn.append(rect)
+        return rect
+
+    def present(self) -> None:
+        """
+        Pushes the changed parts of the screen to the display.
+        """
+        if self.restored is None:
+            pg.display.update()
+        else:
+            pg.display.update(self.restored + self.drawn)
@@ -0,0 +1,50 @@
+import pygame as pg
+
+
+class DirtyRenderer:
+    """
+    Pushes only the changed parts of the screen to the display, instead of flipping the whole frame.
+
+    A part changed if something was drawn on it this frame or the last one (whatever moved away has to be painted
+    over). Once those parts cover more than :param threshold: of the screen, a full flip is cheaper and done instead.
+    """
+
+    def __init__(self, screen: pg.Surface, threshold: float):
+        self.screen_rect = screen.get_rect()
+        self.max_area = threshold * self.screen_rect.width * self.screen_rect.height
+        self.previous = None
+
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def invalidate(self) -> None:
+        """
+        The next frame gets flipped whole, e.g. after a menu was drawn over the game.
+        """
+        self.previous = None
+
+    def present(self, rects) -> None:
+        """
+        :param rects: everything drawn this frame, None if that's unknown (the whole screen)
+        """
+        if rects is not None:
+            rects = [rect.clip(self.screen_rect) for rect in rects]
+
+        if rects is None or self.previous is None:
+            self._flip()
+        else:
+            dirty = [rect for rect in self.previous + rects if rect.width and rect.height]
+            if sum(rect.width * rect.height for rect in dirty) > self.max_area:
+                self._flip()
+            else:
+                self.partial_updates += 1
+                pg.display.update(dirty)
+
+        self.previous = rects
+
+    def _flip(self) -> None:
+        self.full_updates += 1
+        pg.display.flip()
+
+    def stats(self) -> dict:
+        return {'full': self.full_updates, 'partial': self.partial_updates}
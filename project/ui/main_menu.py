@@ -2,11 +2,12 @@ import webbrowser as wb
 from pathlib import PurePath
 
 import pygame as pg
-from pygame.image import load
 
-from project.constants import BACKGROUND, BACKGROUND_3, BUTTONSHEET, CURSOR, CURSOR_HOVER, GIT_LAB_LINK, HEIGHT,\
-    HOVER_SOUND, LOGO, PATH_BACKGROUNDS, PATH_BUTTONS, PATH_CURSORS, PATH_IMAGES, WIDTH
-from project.ui.sheet import Sheet
+from project.constants import BACKGROUND, BACKGROUND_3, CURSOR, CURSOR_HOVER, GIT_LAB_LINK, HEIGHT, HOVER_SOUND, LOGO,\
+    PATH_BACKGROUNDS, PATH_CURSORS, PATH_FX, PATH_IMAGES, WIDTH
+from project.resources import registry
+from project.ui.atlas import atlas
+from project.ui.compositor import LayerCompositor
 from project.ui.volume import get_volume
 
 
@@ -33,26 +34,23 @@ class Home:
         self.air = self.space = 10    # px
         self.shift = 20               # px
 
-        self.sheet = Sheet(str(PurePath(PATH_BUTTONS).joinpath(BUTTONSHEET)))
         if self.paused:
-            self.background = load(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND_3))).convert_alpha()
+            self.background = registry.image(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND_3)), alpha=True)
         else:
-            self.background = load(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND))).convert_alpha()
+            self.background = registry.image(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND)), alpha=True)
 
         self.buttons_hover_states = {'play': False, 'options': False, 'about': False, 'exit': False, 'gitlab': False}
-        self.buttons_sprites = {
-            'play': self.sheet.get_image(0, 0, 384, 70, True),
-            'options': self.sheet.get_image(0, 70, 320, 70, True),
-            'about': self.sheet.get_image(0, 140, 320, 70, True),
-            'exit': self.sheet.get_image(0, 210, 320, 70, True),
-            'gitlab': self.sheet.get_image(320, 70, 100, 100, True),
-            'gitlab_h': self.sheet.get_image(320, 170, 100, 100, True)}
+        self.buttons_sprites = {name: atlas.image(f'button_{name}')
+                                for name in ('play', 'options', 'about', 'exit', 'gitlab', 'gitlab_h')}
 
         # LOGO: 768x360px
         # horizontal - logo takes 3 parts out of 5 - W/5 * 3 = 768px
         # vertical - logo takes half of H - H/2 = 360px
         self.logo_rect = pg.Rect(self.slice, 0, self.slice * 3, HEIGHT / 2)
-        self.logo_image = load(str(PurePath(PATH_IMAGES).joinpath(LOGO))).convert_alpha()
+        self.logo_image = registry.image(str(PurePath(PATH_IMAGES).joinpath(LOGO)), alpha=True)
+
+        self.layers = LayerCompositor(self.screen, 'home_paused' if self.paused else 'home',
+                                      ((self.background, (0, 0)), (self.logo_image, self.logo_rect)))
 
         # PLAY BUTTON (larger) 384x70px
         # horizontal - one part and half of 5 = W/5 * 1.5 = 384px
@@ -71,11 +69,11 @@ class Home:
         self.gitlab_button_rect = pg.Rect(WIDTH - 100 - 20, HEIGHT - 100 - 20, 200, 200)
         self.buttons_dict = {'options': 5, 'about': 6, 'exit': 7}
 
-        self.sound = HOVER_SOUND
+        self.sound = registry.sound(str(PurePath(PATH_FX).joinpath(HOVER_SOUND)))
         self.sound.set_volume(get_volume())
 
-        self.cursor = load(str(PurePath(PATH_CURSORS).joinpath(CURSOR))).convert_alpha()
-        self.cursor2 = load(str(PurePath(PATH_CURSORS).joinpath(CURSOR_HOVER))).convert_alpha()
+        self.cursor = registry.image(str(PurePath(PATH_CURSORS).joinpath(CURSOR)), alpha=True)
+        self.cursor2 = registry.image(str(PurePath(PATH_CURSORS).joinpath(CURSOR_HOVER)), alpha=True)
         self.once = True
 
     def draw(self)-> None:
@@ -93,14 +91,13 @@ class Home:
         self._play_sound()
         self._draw_cursor(x, y)
 
-        pg.display.update()
+        self.layers.present()
 
     def _draw_background(self)->None:
         """
-        Bliting the background image and the game logo on the screen.
+        Bliting the background image and the game logo on the screen (baked into one layer).
         """
-        self.screen.blit(self.background, (0, 0))
-        self.screen.blit(self.logo_image, self.logo_rect)
+        self.layers.begin()
 
     def _draw_cursor(self, x: int, y: int)->None:
         """
@@ -108,9 +105,9 @@ class Home:
         Classical cursor and finger cursor (if any hoverable element is hovered).
         """
         if any(self.buttons_hover_states.values()):
-            self.screen.blit(self.cursor2, (x, y))
+            self.layers.blit(self.cursor2, (x, y))
         else:
-            self.screen.blit(self.cursor, (x, y))
+            self.layers.blit(self.cursor, (x, y))
 
     def _draw_play_button(self, x: int, y: int)-> None:
         """
@@ -124,11 +121,11 @@ class Home:
         if hovered:
             self.buttons_hover_states['play'] = True
             self.play_button_rect.left = self.shift
-            self.screen.blit(self.buttons_sprites['play'], self.play_button_rect)
+            self.layers.blit(self.buttons_sprites['play'], self.play_button_rect)
         else:
             self.buttons_hover_states['play'] = False
             self.play_button_rect.left = self.space
-            self.screen.blit(self.buttons_sprites['play'], self.play_button_rect)
+            self.layers.blit(self.buttons_sprites['play'], self.play_button_rect)
 
     def _draw_other_buttons(self, x, y):
         """
@@ -148,11 +145,11 @@ class Home:
         if hovered:
             self.buttons_hover_states[button] = True
             self.other_button_rect.left = self.shift
-            self.screen.blit(self.buttons_sprites[button], self.other_button_rect)
+            self.layers.blit(self.buttons_sprites[button], self.other_button_rect)
         else:
             self.buttons_hover_states[button] = False
             self.other_button_rect.left = self.space
-            self.screen.blit(self.buttons_sprites[button], self.other_button_rect)
+            self.layers.blit(self.buttons_sprites[button], self.other_button_rect)
 
     def _draw_gitlab_button(self, x: int, y: int)-> None:
         """
@@ -163,10 +160,10 @@ class Home:
 
         if hovered:
             self.buttons_hover_states['gitlab'] = True
-            self.screen.blit(self.buttons_sprites['gitlab_h'], self.gitlab_button_rect)
+            self.layers.blit(self.buttons_sprites['gitlab_h'], self.gitlab_button_rect)
         else:
             self.buttons_hover_states['gitlab'] = False
-            self.screen.blit(self.buttons_sprites['gitlab'], self.gitlab_button_rect)
+            self.layers.blit(self.buttons_sprites['gitlab'], self.gitlab_button_rect)
 
     def _play_sound(self)-> None:
         """
@@ -178,12 +175,6 @@ class Home:
             self.sound.play()
             self.once = False
 
-    def update_volume(self)->None:
-        """
-        Updating the power of the volume if needed.
-        """
-        self.sound.set_volume(get_volume())
-
     @staticmethod
     def _hovered(x: int, y: int, button: pg.Rect)-> bool:
         """
@@ -1,11 +1,12 @@
-import json
 from pathlib import PurePath
 
 import pygame as pg
-from pygame.image import load
 
 from project.constants import BACKGROUND_3, BACK_BUTTON, CURSOR, CURSOR_HOVER, FPS, HOVER_SOUND, PATH_BACKGROUNDS,\
-    PATH_BUTTONS, PATH_CURSORS, PATH_PROJECT, SWITCH, VOLUME, VOLUME_NO
+    PATH_BUTTONS, PATH_CURSORS, PATH_FX, SWITCH, VOLUME, VOLUME_NO
+from project.resources import registry
+from project.settings import settings
+from project.ui.compositor import LayerCompositor
 from project.ui.volume import get_volume
 
 
@@ -21,10 +22,10 @@ class Options:
         Constructor for the options page.
         """
         self.screen = screen
-        self.background = load(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND_3)))
+        self.background = registry.image(str(PurePath(PATH_BACKGROUNDS).joinpath(BACKGROUND_3)))
         self.sound = None
 
-        self.back_btn = load(str(PurePath(PATH_BUTTONS).joinpath(BACK_BUTTON)))
+        self.back_btn = registry.image(str(PurePath(PATH_BUTTONS).joinpath(BACK_BUTTON)))
         self.back_btn_rect = pg.Rect(20, 20, self.back_btn.get_width(), self.back_btn.get_height())
         self.back_btn_hover = False
 
@@ -32,29 +33,30 @@ class Options:
         self.mouseclick = False
 
         self.shift = 40
-        self.cursor = load(str(PurePath(PATH_CURSORS).joinpath(CURSOR))).convert_alpha()
-        self.cursor2 = load(str(PurePath(PATH_CURSORS).joinpath(CURSOR_HOVER))).convert_alpha()
+        self.cursor = registry.image(str(PurePath(PATH_CURSORS).joinpath(CURSOR)), alpha=True)
+        self.cursor2 = registry.image(str(PurePath(PATH_CURSORS).joinpath(CURSOR_HOVER)), alpha=True)
 
-        self.volume = load(str(PurePath(PATH_BUTTONS).joinpath(VOLUME))).convert_alpha()
-        self.novolume = load(str(PurePath(PATH_BUTTONS).joinpath(VOLUME_NO))).convert_alpha()
+        self.volume = registry.image(str(PurePath(PATH_BUTTONS).joinpath(VOLUME)), alpha=True)
+        self.novolume = registry.image(str(PurePath(PATH_BUTTONS).joinpath(VOLUME_NO)), alpha=True)
 
-        self.switch = load(str(PurePath(PATH_BUTTONS).joinpath(SWITCH))).convert_alpha()
+        self.switch = registry.image(str(PurePath(PATH_BUTTONS).joinpath(SWITCH)), alpha=True)
         self.switch_rect = pg.Rect(self._volume_to_pixels(), 150, self.switch.get_width(), self.switch.get_height())
         self.clicked_switch = False
 
         self.intro_played = self._intro_state()
-        self.intro_button_on = load(str(PurePath(PATH_BUTTONS).joinpath('on_btn.png'))).convert_alpha()
-        self.intro_button_off = load(str(PurePath(PATH_BUTTONS).joinpath('off_btn.png'))).convert_alpha()
+        self.intro_button_on = registry.image(str(PurePath(PATH_BUTTONS).joinpath('on_btn.png')), alpha=True)
+        self.intro_button_off = registry.image(str(PurePath(PATH_BUTTONS).joinpath('off_btn.png')), alpha=True)
         self.intro_hovered = False
 
-        self.on = load(str(PurePath(PATH_BUTTONS).joinpath('on.png'))).convert_alpha()
-        self.off = load(str(PurePath(PATH_BUTTONS).joinpath('off.png'))).convert_alpha()
-        self.intro_img = load(str(PurePath(PATH_BUTTONS).joinpath('intro.png'))).convert_alpha()
+        self.on = registry.image(str(PurePath(PATH_BUTTONS).joinpath('on.png')), scale=(100, 50), alpha=True)
+        self.off = registry.image(str(PurePath(PATH_BUTTONS).joinpath('off.png')), scale=(100, 50), alpha=True)
+        self.intro_img = registry.image(str(PurePath(PATH_BUTTONS).joinpath('intro.png')), alpha=True)
 
-        self.on = pg.transform.scale(self.on, (100, 50))
-        self.off = pg.transform.scale(self.off, (100, 50))
+        self.layers = LayerCompositor(
+            self.screen, 'options',
+            ((self.background, (0, 0)), (self.intro_img, (875, 50)), (self.off, (810, 170)), (self.on, (1120, 170))))
 
-        self.sound = HOVER_SOUND
+        self.sound = registry.sound(str(PurePath(PATH_FX).joinpath(HOVER_SOUND)))
         self.sound.set_volume(get_volume())
 
         self.once = True
@@ -85,8 +87,7 @@ class Options:
                     self.intro_played = not self.intro_played
             self._pixels_to_volume()
             self._save_intro_state()
-            pg.display.update()
-            pg.mixer.music.set_volume(get_volume())
+            self.layers.present()
         return running
 
     def draw(self):
@@ -105,9 +106,9 @@ class Options:
 
     def _draw_background(self):
         """
-        Bliting the background image and the on the screen.
+        Bliting the background image and the intro labels on the screen (baked into one layer).
         """
-        self.screen.blit(self.background, (0, 0))
+        self.layers.begin()
 
     def _draw_cursor(self):
         """
@@ -115,55 +116,43 @@ class Options:
         Classical cursor and finger cursor (if any hoverable element is hovered).
         """
         if self.back_btn_hover or self.clicked_switch or self.intro_hovered:
-            self.screen.blit(self.cursor2, (self.x, self.y))
+            self.layers.blit(self.cursor2, (self.x, self.y))
         else:
-            self.screen.blit(self.cursor, (self.x, self.y))
+            self.layers.blit(self.cursor, (self.x, self.y))
 
     def _draw_volume(self)->None:
         """
         Bliting the volume bar on the screen.
         """
         if 120 < self.switch_rect.left < 133:
-            self.screen.blit(self.novolume, (20, 140))
+            self.layers.blit(self.novolume, (20, 140))
             self.mute = True
         else:
-            self.screen.blit(self.volume, (20, 140))
+            self.layers.blit(self.volume, (20, 140))
             self.mute = False
 
     def _draw_intro(self)->None:
         """
-        Bliting the intro labels on the screen. (INRO, ON, OFF).
+        Bliting the intro button on the screen, its labels (INTRO, ON, OFF) are part of the background.
         """
         self.intro_hovered = self._hovered(self.x, self.y, pg.Rect(920, 150, 200, 100))
 
         if self.intro_played:
-            self.screen.blit(self.intro_button_on, (920, 150))
+            self.layers.blit(self.intro_button_on, (920, 150))
         else:
-            self.screen.blit(self.intro_button_off, (920, 150))
-
-        self.screen.blit(self.intro_img, (875, 50))
-        self.screen.blit(self.off, (810, 170))
-        self.screen.blit(self.on, (1120, 170))
+            self.layers.blit(self.intro_button_off, (920, 150))
 
     def _intro_state(self)->True:
         """
-        Extracting the intro state (on or off) from the data.json file.
+        Extracting the intro state (on or off) from the settings.
         """
-        with open(str(PurePath(PATH_PROJECT).joinpath('data.json'))) as f:
-            data = json.load(f)
-            played = data['intro_played']
-        return played
+        return settings['intro_played']
 
     def _save_intro_state(self)->None:
         """
-        Saving the intro state (on or off) to the data.json file.
+        Saving the intro state (on or off) to the settings, only written to data.json if it changed.
         """
-        with open(str(PurePath(PATH_PROJECT).joinpath('data.json'))) as f:
-            data = json.load(f)
-
-        with open(str(PurePath(PATH_PROJECT).joinpath('data.json')), 'w') as f:
-            data['intro_played'] = self.intro_played
-            json.dump(data, f)
+        settings.update(intro_played=self.intro_played)
 
     def _draw_switch(self)->None:
         """
@@ -179,7 +168,7 @@ class Options:
         else:
             self.clicked_switch = False
 
-        self.screen.blit(self.switch, self.switch_rect)
+        self.layers.blit(self.switch, self.switch_rect)
 
     def _draw_back_button(self)->None:
         """
@@ -193,35 +182,25 @@ class Options:
             self.back_btn_rect.left = self.shift
         else:
             self.back_btn_rect.left = 20
-        self.screen.blit(self.back_btn, self.back_btn_rect)
+        self.layers.blit(self.back_btn, self.back_btn_rect)
 
     def _volume_to_pixels(self)->int:
         """
-        Converting the volume value from the data.json file to pixels for the volume bar.
+        Converting the volume value from the settings to pixels for the volume bar.
         """
-        with open(str(PurePath(PATH_PROJECT).joinpath('data.json'))) as f:
-            data = json.load(f)
-        return 122 + int(data['volume'] * 5.7)
+        return 122 + int(settings['volume'] * 5.7)
 
     def _pixels_to_volume(self)->None:
         """
-        Converting the pixels for volume and saving it to the data.json file.
+        Converting the pixels for volume and saving it to the settings, only written to data.json if it changed.
+        The volume subscribers (music, hover sound) get notified by the settings.
         """
-        with open(str(PurePath(PATH_PROJECT).joinpath('data.json'))) as f:
-            data = json.load(f)
-
-        with open(str(PurePath(PATH_PROJECT).joinpath('data.json')), 'w') as f:
-            data['volume'] = (self.switch_rect.left - 122) // 5.7
-            data['mute'] = self.mute
-            json.dump(data, f)
+        settings.update(volume=(self.switch_rect.left - 122) // 5.7, mute=self.mute)
 
     def _play_sound(self)->None:
         """
         Playing the sound if any hoverable element is hovered.
-        Ensuring the current volume coresponds to the value in the data.json file.
         """
-        self.sound.set_volume(get_volume())
-
         if not self.back_btn_hover:
             self.once = True
         elif self.once:
@@ -0,0 +1,101 @@
+import time
+from collections import deque
+from pathlib import PurePath
+
+import pygame as pg
+
+from project.constants import Color, DEFAULT_FONT_NAME, PATH_FONTS
+from project.ui.text import fonts
+
+
+class FrameProfiler:
+    """
+    Times every frame and the phases it's made of, and shows them in an overlay.
+
+    The game calls begin() at the start of every frame, after the clock waited, then mark() at the end of every
+    phase, so each phase takes the time since the previous mark. Phases marked more than once a frame (every tick
+    runs update and collide) add up. The last :param window: frames are kept for the percentiles.
+    """
+    phases = ('events', 'update', 'collide', 'draw', 'flip')
+
+    def __init__(self, window: int, refresh: int, overlay: bool = True):
+        """
+        :param refresh: frames between two updates of the overlay's text
+        :param overlay: draw() shows the overlay, the numbers are only collected otherwise (see stats())
+        """
+        self.frames = deque(maxlen=window)
+        self.times = {phase: deque(maxlen=window) for phase in FrameProfiler.phases}
+        self.current = dict.fromkeys(FrameProfiler.phases, 0.0)
+        self.started = None
+        self.last = None
+
+        self.refresh = refresh
+        self.overlay = overlay
+        self.font = fonts.get(str(PurePath(PATH_FONTS).joinpath(DEFAULT_FONT_NAME)), 14)
+        self.panel = None
+        self.countdown = 0
+
+    def begin(self) -> None:
+        now = time.perf_counter()
+        if self.started is not None:
+            self.frames.append((now - self.started) * 1000)
+            for phase, duration in self.current.items():
+                self.times[phase].append(duration * 1000)
+                self.current[phase] = 0.0
+        self.started = self.last = now
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    @staticmethod
+    def percentile(values, share: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+    def stats(self) -> dict:
+        """
+        Percentiles of the frame time and mean time of every phase, in milliseconds.
+        """
+        stats = {f'frame p{share}': self.percentile(self.frames, share / 100) for share in (50, 95, 99)}
+        for phase, times in self.times.items():
+            stats[phase] = sum(times) / len(times) if times else 0.0
+        return stats
+
+    def draw(self, screen: pg.Surface, counts: dict, pairs: dict) -> list:
+        """
+        Draws the overlay in the bottom left corner, out of the HUD's way, returns the rects it covers.
+
+        :param counts: live entities by name
+        :param pairs: rect tests of the last tick by collision grid
+        """
+        if not self.overlay:
+            return []
+        if self.panel is None or self.countdown <= 0:
+            self.panel = self._render(counts, pairs)
+            self.countdown = self.refresh
+        self.countdown -= 1
+        return [screen.blit(self.panel, self.panel.get_rect(bottomleft=screen.get_rect().bottomleft))]
+
+    def _render(self, counts: dict, pairs: dict) -> pg.Surface:
+        stats = self.stats()
+        lines = [
+            f'frame {self.frames[-1] if self.frames else 0:5.1f} ms  p50 {stats["frame p50"]:5.1f}  '
+            f'p95 {stats["frame p95"]:5.1f}  p99 {stats["frame p99"]:5.1f}',
+            f'events {stats["events"]:4.1f}  update {stats["update"] + stats["collide"]:4.1f} '
+            f'(collide {stats["collide"]:4.1f})  draw {stats["draw"]:4.1f}  flip {stats["flip"]:4.1f}',
+            '  '.join(f'{name} {count}' for name, count in counts.items()),
+            'pairs tested  ' + '  '.join(f'{name} {count}' for name, count in pairs.items()),
+        ]
+        rendered = [self.font.render(line, True, Color.white) for line in lines]
+        panel = pg.Surface((max(line.get_width() for line in rendered) + 10,
+                            sum(line.get_height() for line in rendered) + 10), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        y = 5
+        for line in rendered:
+            panel.blit(line, (5, y))
+            y += line.get_height()
+        return panel
@@ -1,8 +1,7 @@
 from pathlib import PurePath
 
-import pygame as pg
-
 from project.constants import Color, PATH_FONTS
+from project.ui.text import digit_atlas, fonts
 
 
 class ScoreDisplay:
@@ -15,12 +14,16 @@ class ScoreDisplay:
         self.x = x
         self.y = y
 
-        self.font = pg.font.Font(str(PurePath(PATH_FONTS).joinpath(font)), font_size)
+        self.font = fonts.get(str(PurePath(PATH_FONTS).joinpath(font)), font_size)
+        self.digits = digit_atlas(self.font, Color.white)
+        self.drawn = []
 
     def draw(self)->None:
         if self.game.score >= 1000000:
             score_text = '9999999'
         else:
             score_text = str(self.game.score).zfill(7)
-        text = self.font.render(score_text, True, Color.white)
-        self.screen.blit(text, (self.x, self.y))
+        self.drawn = [self.digits.draw(self.screen, score_text, (self.x, self.y))]
+
+    def dirty_rects(self) -> list:
+        return self.drawn
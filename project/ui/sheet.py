@@ -1,4 +1,4 @@
-import pygame as pg
+from project.resources import registry
 
 
 class Sheet:
@@ -8,19 +8,15 @@ class Sheet:
     def __init__(self, sheet_path):
         """
         Constructor for the sheet tool.
-        Loading the spritesheet.
+        Loading the spritesheet (only once, every Sheet of the same file shares it).
         """
-        self.spritesheet = pg.image.load(sheet_path).convert_alpha()
+        self.path = str(sheet_path)
+        self.spritesheet = registry.image(self.path, alpha=True)
 
-    def get_image(self, x, y, width, height, alpha=False):
+    def get_image(self, x, y, width, height, alpha=False, scale=None):
         """
         Extracts sprite of given point (x, y) (left, top) and width and height.
-        alpha boolean keyword argument for converting the sprite in alpha or non-alpha.
+        alpha False drops the sprite's per-pixel alpha, otherwise the asset registry picks the pixel format.
+        scale optional (width, height) the sprite gets scaled to.
         """
-        image = pg.Surface((width, height))
-        image.blit(self.spritesheet, (0, 0), (x, y, width, height))
-        image.set_colorkey((0, 0, 0))
-        image.set_alpha(255)
-        if alpha:
-            return image.convert_alpha()
-        return image.convert()
+        return registry.image(self.path, (x, y, width, height), scale, alpha)
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from pathlib import PurePath
+
+import pygame as pg
+
+from project.constants import TEXT_CACHE_SIZE
+from project.startup import trace
+
+
+class FontRegistry:
+    """
+    One pg.font.Font per (file, size), instead of loading the file again for every widget.
+    """
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, file: str, size: int) -> pg.font.Font:
+        font = self.fonts.get((file, size))
+        if font is None:
+            with trace.phase(f'font {PurePath(file).name} {size}'):
+                font = self.fonts[(file, size)] = pg.font.Font(file, size)
+        return font
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, color), the least recently used get dropped past :param limit:
+    entries.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.surfaces = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font: pg.font.Font, text: str, color) -> pg.Surface:
+        """
+        Same as font.render(text, True, color), rendered once.
+        """
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, True, color)
+        while len(self.surfaces) > self.limit:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.surfaces)}
+
+
+class DigitAtlas:
+    """
+    The digits (and :param extra: characters) of a font rendered once, numbers are drawn glyph by glyph from them
+    without calling render at all.
+
+    Meant for fixed-width fonts, every glyph is placed at the font's advance for it.
+    """
+
+    def __init__(self, font: pg.font.Font, color, extra: str = ':'):
+        self.glyphs = {}
+        for char in '0123456789' + extra:
+            self.glyphs[char] = (font.render(char, True, color), font.metrics(char)[0][4])
+        self.height = font.get_height()
+
+    def size(self, text: str) -> tuple:
+        return sum(self.glyphs[char][1] for char in text), self.height
+
+    def draw(self, screen: pg.Surface, text: str, position: tuple) -> pg.Rect:
+        """
+        Blits :param text: with its topleft at :param position:, returns the area it covers.
+        """
+        x, y = position
+        blits = []
+        for char in text:
+            glyph, advance = self.glyphs[char]
+            blits.append((glyph, (x, y)))
+            x += advance
+        screen.blits(blits, doreturn=False)
+        return pg.Rect(position, self.size(text))
+
+
+def digit_atlas(font: pg.font.Font, color) -> DigitAtlas:
+    """
+    The shared DigitAtlas of :param font: in :param color:
+    """
+    key = (font, tuple(color))
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = DigitAtlas(font, color)
+    return atlas
+
+
+fonts = FontRegistry()
+texts = TextCache(TEXT_CACHE_SIZE)
+_atlases = {}
@@ -1,8 +1,8 @@
 from pathlib import PurePath
 
-import pygame as pg
-
+from project import simulation
 from project.constants import Color, PATH_FONTS
+from project.ui.text import digit_atlas, fonts, texts
 
 
 class Timer:
@@ -13,6 +13,17 @@ class Timer:
 
     The timer counts down from given seconds.
     """
+    EFFECTS = {
+        'red': ' You got extra hp',
+        'pink': 'Your hp is now full',
+        'purple': 'Double shot!',
+        'blue': 'You shield is now full',
+        'yellow': 'You are now immune!',
+        'white': 'You shoot faster!',
+        'green': 'More armor!',
+        'w_green': 'More damage!'
+    }
+
     def __init__(self, game, time: int, x: int, y: int, font: str, font_size: int, text: bool=False, _type: str =None):
         """
         Constructor for the timer.
@@ -28,51 +39,47 @@ class Timer:
         self.display_text = text
         self.type = _type
 
-        self.font = pg.font.Font(str(PurePath(PATH_FONTS).joinpath(font)), font_size)
+        self.font = fonts.get(str(PurePath(PATH_FONTS).joinpath(font)), font_size)
+        self.digits = digit_atlas(self.font, Color.white)
         self.time = time
-        self.start = pg.time.get_ticks()
-        self.start_text = pg.time.get_ticks()
+        self.start = simulation.get_ticks()
+        self.start_text = simulation.get_ticks()
         self.completed = False
         self.show_text = False
+        self.drawn = []
 
     def draw(self)->None:
         """
         Bliting the timer on the screen.
         """
-        self.effect_dict =\
-            {
-                'red': ' You got extra hp',
-                'pink': 'Your hp is now full',
-                'purple': 'Double shot!',
-                'blue': 'You shield is now full',
-                'yellow': 'You are now immune!',
-                'white': 'You shoot faster!',
-                'green': 'More armor!',
-                'w_green': 'More damage!'
-            }
-
-        if not self.completed:
-            self.current = (pg.time.get_ticks() - self.start) // 1000
-            if self.current <= self.time:
-                self.text = self.font.render(self.min_sec(self.time - self.current), True, Color.white)
-
+        self.drawn = []
         if not self.display_text:
             if not self.completed:
 
-                self.current = (pg.time.get_ticks() - self.start) // 1000
+                self.current = (simulation.get_ticks() - self.start) // 1000
 
                 if self.current <= self.time:
-                    self.text = self.font.render(self.min_sec(self.time - self.current), True, Color.white)
-
-                    self.screen.blit(self.text, (self.x, self.y))
+                    self.drawn.append(
+                        self.digits.draw(self.screen, self.min_sec(self.time - self.current), (self.x, self.y)))
 
         if self.display_text:
             if not self.show_text:
-                self.current = (pg.time.get_ticks() - self.start_text) // 1000
+                self.current = (simulation.get_ticks() - self.start_text) // 1000
                 if self.current <= 2:
-                    self.text_str = self.font.render(self.effect_dict[self.type], True, Color.white)
+                    self.drawn.append(
+                        self.screen.blit(texts.render(self.font, self.EFFECTS[self.type], Color.white), (100, 100)))
 
-                    self.screen.blit(self.text_str, (100, 100))
+    def dirty_rects(self) -> list:
+        return self.drawn
+
+    @property
+    def expired(self) -> bool:
+        """
+        Nothing is left to show, the game drops the timer.
+        """
+        if self.display_text:
+            return (simulation.get_ticks() - self.start_text) // 1000 > 2
+        return (simulation.get_ticks() - self.start) // 1000 > self.time
 
     @staticmethod
     def min_sec(sec: int)->str:
@@ -1,17 +1,9 @@
-import json
-from pathlib import PurePath
-
-from project.constants import PATH_PROJECT
+from project.settings import settings
 
 
 def get_volume()->float:
     """
-    Returns the volume value from the data.json file.
+    Returns the volume value from the settings (data.json is only read once).
     Output ready for pygame.Sound.set_volume function.
     """
-    with open(str(PurePath(PATH_PROJECT).joinpath('data.json'))) as f:
-        data = json.load(f)
-
-    if data['mute']:
-        return 0
-    return data['volume'] / 100
+    return settings.volume()
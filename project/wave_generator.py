@@ -1,14 +1,15 @@
 import logging
 import math
-import random
-from pathlib import PurePath
 
 import pygame as pg
 
-from project.constants import FIGHTER_IMAGE_NAME, HEIGHT, MINE_IMAGE_NAME, PATH_IMAGES, STRUCTURE_IMAGE_NAME, WIDTH
+from project import simulation
+from project.constants import HEIGHT, WIDTH
 from project.sprites.fighter import Fighter
+from project.sprites.game_elements import Item, Projectile
 from project.sprites.mine import Mine
 from project.sprites.structure import Structure
+from project.ui.atlas import atlas
 
 logger = logging.getLogger('last_judgment_logger')
 
@@ -20,36 +21,59 @@ class WaveGenerator:
         self.game = game
         self.game.nonsprite.add(self)
         self.difficulty = 1
-        self.structure_image = pg.image.load(str(PurePath(PATH_IMAGES).joinpath(STRUCTURE_IMAGE_NAME)))
-        self.fighter_image = pg.image.load(str(PurePath(PATH_IMAGES).joinpath(FIGHTER_IMAGE_NAME)))
-        self.mine_image = pg.image.load(str(PurePath(PATH_IMAGES).joinpath(MINE_IMAGE_NAME)))
+        self.preload()
+
+    @staticmethod
+    def preload() -> None:
+        """
+        Decodes everything a wave can spawn up front, so spawning never touches the disk mid-frame.
+        """
+        Fighter.load_images()
+        Structure.load_images()
+        Mine.load_images()
+        for color in Item.colors:
+            Item.load_image(color)
+        Projectile.load_image('red', 0.5)  # Fighter
+        Projectile.load_image('orange', 1)  # Structure
+        Projectile.load_image('green', 1)  # Character
+        Projectile.load_image('purple', 1)  # Character with double shot
+
+    @staticmethod
+    def preload_files() -> list:
+        """
+        The image files preload() reads.
+        """
+        blasters = [Projectile.blasters[color] for color in ('red', 'orange', 'green', 'purple')]
+        return [Fighter.path, Structure.path, atlas.file] + blasters
 
     def _generate(self, difficulty: int) -> None:
-        for _ in range(math.floor(random.uniform(0, 0.25 * difficulty))):
-            fighter = Fighter(
+        rng = simulation.rng
+
+        for _ in range(math.floor(rng.uniform(0, 0.25 * difficulty))):
+            fighter = self.game.kind(Fighter)(
                 self.game,
                 -0.04,
-                pg.Vector2(WIDTH, random.uniform(0, HEIGHT)),
+                pg.Vector2(WIDTH, rng.uniform(0, HEIGHT)),
                 difficulty*50,
-                10 + 2 * random.randint(0, difficulty),
+                10 + 2 * rng.randint(0, difficulty),
                 1+0.25*difficulty)
             logger.debug(f'Spawned a Fighter at {fighter.pos}')
 
-        for _ in range(math.floor(random.uniform(1, math.sqrt(difficulty)))):
-            structure = Structure(
+        for _ in range(math.floor(rng.uniform(1, math.sqrt(difficulty)))):
+            structure = self.game.kind(Structure)(
                 self.game,
-                WIDTH - random.randint(50, 300),
-                pg.Vector2(random.uniform(0.5, 2), 1),
-                pg.Vector2(WIDTH, random.randint(75, HEIGHT - 75)),
-                random.randint(2, max(2 + difficulty, 4*difficulty)),
+                WIDTH - rng.randint(50, 300),
+                pg.Vector2(rng.uniform(0.5, 2), 1),
+                pg.Vector2(WIDTH, rng.randint(75, HEIGHT - 75)),
+                rng.randint(2, max(2 + difficulty, 4*difficulty)),
                 difficulty * 50)
             logger.debug(f'Spawned a Structure at {structure.pos}')
 
-        for _ in range(math.floor(random.uniform(0, math.sqrt(0.25*difficulty)))):
-            mine = Mine(
+        for _ in range(math.floor(rng.uniform(0, math.sqrt(0.25*difficulty)))):
+            mine = self.game.kind(Mine)(
                 self.game,
-                pg.Vector2(random.uniform(0.5, 4), 0),
-                pg.Vector2(WIDTH, random.uniform(200, HEIGHT - 200)),
+                pg.Vector2(rng.uniform(0.5, 4), 0),
+                pg.Vector2(WIDTH, rng.uniform(200, HEIGHT - 200)),
                 difficulty * 3,
                 difficulty * 400
             )